@@ -0,0 +1,75 @@
+"""Compara encontrar_cargo_mais_alto com o ResolvedorCargos numa guild sintética
+
+Uso: python benchmarks/bench_resolvedor_cargos.py [membros] [repeticoes]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.painel_hierarquia import CARGOS_REAIS, ResolvedorCargos, encontrar_cargo_mais_alto
+
+class Cargo:
+    def __init__(self, role_id, nome):
+        self.id = role_id
+        self.name = nome
+
+class Membro:
+    def __init__(self, member_id, roles):
+        self.id = member_id
+        self.roles = roles
+        self.bot = False
+
+class Guild:
+    def __init__(self, roles, members):
+        self.roles = roles
+        self.members = members
+
+def criar_guild(total_membros, seed=42):
+    """Guild com os cargos da hierarquia + cargos comuns e membros com 1 a 6 cargos"""
+    aleatorio = random.Random(seed)
+    everyone = Cargo(0, "@everyone")
+    cargos = [Cargo(i + 1, cargo["nome"]) for i, cargo in enumerate(CARGOS_REAIS)]
+    cargos += [Cargo(1000 + i, f"🎮 | Cargo Extra {i}") for i in range(40)]
+
+    membros = []
+    for member_id in range(total_membros):
+        roles = [everyone] + aleatorio.sample(cargos, aleatorio.randint(1, 6))
+        membros.append(Membro(member_id, roles))
+
+    return Guild([everyone] + cargos, membros)
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    total_membros = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    guild = criar_guild(total_membros)
+
+    resolvedor = ResolvedorCargos()
+    tempo_montagem = medir(lambda: resolvedor.construir(guild), repeticoes)
+
+    # Os dois caminhos precisam concordar antes de comparar tempos
+    for membro in guild.members:
+        esperado = encontrar_cargo_mais_alto(membro, CARGOS_REAIS)
+        obtido = resolvedor.cargo_mais_alto(membro)
+        assert (esperado and esperado["prioridade"]) == (obtido and obtido["prioridade"]), membro.id
+
+    tempo_antigo = medir(lambda: [encontrar_cargo_mais_alto(m, CARGOS_REAIS) for m in guild.members], repeticoes)
+    tempo_novo = medir(lambda: [resolvedor.cargo_mais_alto(m) for m in guild.members], repeticoes)
+
+    print(f"📊 Guild sintética: {total_membros} membros, {len(guild.roles)} cargos (melhor de {repeticoes})")
+    print(f"  encontrar_cargo_mais_alto: {tempo_antigo * 1000:.1f} ms")
+    print(f"  ResolvedorCargos:          {tempo_novo * 1000:.1f} ms (+ {tempo_montagem * 1000:.2f} ms para montar)")
+    print(f"  🚀 {tempo_antigo / tempo_novo:.0f}x mais rápido")
+
+if __name__ == "__main__":
+    main()
@@ -71,9 +71,6 @@ intents.guilds = True
 bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
 keep_alive = KeepAliveServer()
 
-# Dicionário global de canais (compartilhado entre módulos)
-canais_aprovacao = {}
-
 # ==================== EVENTOS ====================
 @bot.event
 async def on_ready():
@@ -129,7 +126,7 @@ async def custom_help(ctx, *, comando: str = None):
     # Comandos de Sets
     embed.add_field(
         name="🎮 **Sets**",
-        value="`!setup_set` `!aprovamento` `!check_id` `!sets_pendentes`",
+        value="`!setup_set` `!aprovamento` `!check_id` `!sets_pendentes` `!aprovar_todos` `!recusar_todos` `!ids_duplicados`",
         inline=False
     )
     
@@ -143,7 +140,7 @@ async def custom_help(ctx, *, comando: str = None):
     # Comandos do Painel de Recrutadores
     embed.add_field(
         name="🏆 **Painel de Recrutadores**",
-        value="`!setup_painel` `!rec_stats` `!rec_reset`",
+        value="`!setup_painel` `!rec_stats` `!rec_periodo` `!rec_reset`",
         inline=False
     )
     
@@ -207,6 +204,20 @@ async def status(ctx):
     embed.add_field(name="📡 Ping", value=f"{round(bot.latency * 1000)}ms", inline=True)
     embed.add_field(name="🏠 Servidores", value=len(bot.guilds), inline=True)
     
+    # Chamadas à API dos painéis (ignoradas = render idêntico ao último envio)
+    linhas_paineis = []
+    for nome, cog in bot.cogs.items():
+        estatisticas = getattr(cog, "estatisticas_api", None)
+        if estatisticas:
+            linhas_paineis.append(f"**{nome}:** {estatisticas['enviadas']} enviadas • {estatisticas['ignoradas']} ignoradas")
+    if linhas_paineis:
+        embed.add_field(name="🖼️ Atualizações de Painéis", value="\n".join(linhas_paineis), inline=False)
+    
+    # Fila de DMs (aprovação/recusa de sets, prêmios)
+    dms = bot.get_cog("MensagensDiretas")
+    if dms:
+        embed.add_field(name="✉️ DMs", value=dms.despachante.resumo(), inline=False)
+    
     # Mostrar módulos carregados
     cogs = list(bot.cogs.keys())
     if cogs:
@@ -227,6 +238,8 @@ async def load_cogs():
     print("🔄 CARREGANDO MÓDULOS...")
     
     cogs = [
+        'modules.mensagens_diretas',
+        'modules.indice_fivem',
         'modules.sets',
         'modules.tickets',
         'modules.config_cargos',
@@ -0,0 +1,72 @@
+import asyncio
+
+# ========== AGENDADOR DE ATUALIZAÇÕES ==========
+class AgendadorAtualizacao:
+    """Agrupa pedidos de atualização por chave (ex: um painel)
+
+    Um pedido só é executado depois de `silencio` segundos sem novos pedidos,
+    mas nunca espera mais que `latencia_maxima` desde o primeiro pedido pendente
+    (sem latência máxima, a janela é fixa: `silencio` após o primeiro pedido).
+    Só o pedido mais recente é executado. Cada chave tem no máximo uma execução
+    em andamento, e pedidos feitos durante a execução geram uma nova rodada no fim.
+    """
+
+    def __init__(self, silencio=3.0, latencia_maxima=None):
+        self.silencio = silencio
+        self.latencia_maxima = silencio if latencia_maxima is None else latencia_maxima
+        self.pendentes = {}  # {chave: função async sem argumentos}
+        self.primeiro_pedido = {}  # {chave: instante do primeiro pedido pendente}
+        self.ultimo_pedido = {}  # {chave: instante do pedido mais recente}
+        self.tarefas = {}  # {chave: asyncio.Task}
+        self.execucoes = 0
+        self.pedidos = 0
+
+    def agendar(self, chave, funcao):
+        """Agenda funcao() para a chave; substitui qualquer pedido ainda não executado"""
+        agora = asyncio.get_running_loop().time()
+        self.pendentes[chave] = funcao
+        self.primeiro_pedido.setdefault(chave, agora)
+        self.ultimo_pedido[chave] = agora
+        self.pedidos += 1
+
+        tarefa = self.tarefas.get(chave)
+        if tarefa is None or tarefa.done():
+            self.tarefas[chave] = asyncio.create_task(self._executar(chave))
+
+    def _prazo(self, chave):
+        return min(
+            self.ultimo_pedido[chave] + self.silencio,
+            self.primeiro_pedido[chave] + self.latencia_maxima
+        )
+
+    async def _executar(self, chave):
+        loop = asyncio.get_running_loop()
+        try:
+            while chave in self.pendentes:
+                # Espera o silêncio (ou a latência máxima); novos pedidos empurram o prazo
+                while chave in self.pendentes and loop.time() < self._prazo(chave):
+                    await asyncio.sleep(self._prazo(chave) - loop.time())
+
+                funcao = self.pendentes.pop(chave, None)
+                self.primeiro_pedido.pop(chave, None)
+                self.ultimo_pedido.pop(chave, None)
+                if funcao is None:
+                    break
+
+                self.execucoes += 1
+                try:
+                    await funcao()
+                except Exception as e:
+                    print(f"❌ Erro na atualização agendada ({chave}): {e}")
+        finally:
+            if self.tarefas.get(chave) is asyncio.current_task():
+                del self.tarefas[chave]
+
+    def cancelar_todos(self):
+        """Cancela tudo que está agendado (usado ao descarregar o módulo)"""
+        self.pendentes.clear()
+        self.primeiro_pedido.clear()
+        self.ultimo_pedido.clear()
+        for tarefa in self.tarefas.values():
+            tarefa.cancel()
+        self.tarefas.clear()
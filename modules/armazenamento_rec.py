@@ -0,0 +1,401 @@
+import asyncio
+import json
+import os
+import sqlite3
+
+# ========== CONFIGURAÇÃO ==========
+COLECOES = ("recrutadores", "recrutas", "historico_mensal", "recordes")
+
+SCHEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS recrutadores (
+    id TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_recrutadores_total ON recrutadores(total);
+
+CREATE TABLE IF NOT EXISTS recrutas (
+    id TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    recrutador_id TEXT NOT NULL,
+    pago INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    ts REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_recrutas_recrutador ON recrutas(recrutador_id);
+
+CREATE TABLE IF NOT EXISTS historico_mensal (
+    mes TEXT NOT NULL,
+    recrutador_id TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (mes, recrutador_id)
+);
+CREATE INDEX IF NOT EXISTS idx_historico_recrutador ON historico_mensal(recrutador_id);
+
+CREATE TABLE IF NOT EXISTS recordes (
+    recrutador_id TEXT PRIMARY KEY,
+    maior_mes INTEGER NOT NULL,
+    mes TEXT NOT NULL,
+    nome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recordes_maior_mes ON recordes(maior_mes);
+
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+# ========== JSON ==========
+def gravar_json_atomico(caminho, conteudo):
+    """Grava em arquivo temporário e troca pelo original (nunca deixa o JSON pela metade)"""
+    gravar_texto_atomico(caminho, json.dumps(conteudo, indent=4, ensure_ascii=False))
+
+def gravar_texto_atomico(caminho, texto):
+    """Como gravar_json_atomico, para conteúdo já serializado (pode rodar fora do event loop)"""
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.write(texto)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+class GravacaoAgrupada:
+    """Gravação de um JSON agrupada e fora do event loop
+
+    salvar() só marca os dados como alterados: uma única gravação é agendada
+    para daqui a `intervalo` segundos. O conteúdo é serializado no event loop
+    (cópia consistente) e gravado numa thread (asyncio.to_thread), então o
+    event loop nunca espera o disco. `conteudo()` devolve os dados a gravar.
+    """
+
+    def __init__(self, arquivo, conteudo, intervalo=1.0):
+        self.arquivo = arquivo
+        self.conteudo = conteudo
+        self.intervalo = intervalo
+        self.sujo = False
+        self.gravacao_agendada = None  # asyncio.TimerHandle
+        self.tarefa_gravacao = None
+        self.gravacoes = 0
+
+    def salvar(self):
+        """Marca os dados como alterados e agenda uma gravação agrupada"""
+        self.sujo = True
+        if self.gravacao_agendada or (self.tarefa_gravacao and not self.tarefa_gravacao.done()):
+            return  # a gravação já agendada/em andamento pega esta alteração
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.descarregar()  # fora do event loop (scripts): grava na hora
+            return
+
+        self.gravacao_agendada = loop.call_later(self.intervalo, self._iniciar_gravacao)
+
+    def _iniciar_gravacao(self):
+        self.gravacao_agendada = None
+        self.tarefa_gravacao = asyncio.ensure_future(self._gravar())
+
+    async def _gravar(self):
+        while self.sujo:
+            self.sujo = False
+            texto = json.dumps(self.conteudo(), indent=4, ensure_ascii=False)
+            try:
+                await asyncio.to_thread(gravar_texto_atomico, self.arquivo, texto)
+                self.gravacoes += 1
+            except Exception as e:
+                print(f"❌ Erro ao salvar {self.arquivo}: {e}")
+                self.sujo = True
+                self.gravacao_agendada = asyncio.get_running_loop().call_later(self.intervalo, self._iniciar_gravacao)
+                return
+
+    def descarregar(self):
+        """Grava alterações pendentes na hora (encerramento do bot)"""
+        if self.gravacao_agendada:
+            self.gravacao_agendada.cancel()
+            self.gravacao_agendada = None
+        if not self.sujo:
+            return
+        try:
+            gravar_json_atomico(self.arquivo, self.conteudo())
+            self.sujo = False
+            self.gravacoes += 1
+        except Exception as e:
+            print(f"❌ Erro ao salvar {self.arquivo}: {e}")
+
+class ArmazenamentoJSON:
+    """Um arquivo JSON por coleção (formato original do bot)"""
+
+    def __init__(self, arquivos):
+        self.arquivos = arquivos  # {colecao: caminho}
+
+    def carregar(self):
+        """Lê as coleções existentes em disco"""
+        dados = {colecao: {} for colecao in COLECOES}
+        for colecao in COLECOES:
+            caminho = self.arquivos[colecao]
+            if os.path.exists(caminho):
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    dados[colecao] = json.load(f)
+        return dados
+
+    def salvar(self, dados, alteracoes=None):
+        """Regrava os arquivos das coleções alteradas (todas se alteracoes=None)"""
+        colecoes = COLECOES if alteracoes is None else [c for c in COLECOES if alteracoes.get(c)]
+        for colecao in colecoes:
+            gravar_json_atomico(self.arquivos[colecao], dados[colecao])
+
+    def registrar_evento(self, evento):
+        pass
+
+    def fechar(self):
+        pass
+
+# ========== SQLITE ==========
+class ArmazenamentoSQLite:
+    """Banco SQLite em modo WAL com uma tabela indexada por coleção"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self.conexao.executescript(SCHEMA_SQLITE)
+        self.atualizar_schema()
+        self.conexao.executescript("CREATE INDEX IF NOT EXISTS idx_recrutas_ts ON recrutas(recrutador_id, ts);")
+        self.conexao.commit()
+
+    def atualizar_schema(self):
+        """Adiciona colunas que não existiam em bancos criados por versões anteriores"""
+        colunas = {linha[1] for linha in self.conexao.execute("PRAGMA table_info(recrutas)")}
+        if "ts" not in colunas:
+            self.conexao.execute("ALTER TABLE recrutas ADD COLUMN ts REAL NOT NULL DEFAULT 0")
+
+    def get_meta(self, chave):
+        linha = self.conexao.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def set_meta(self, chave, valor):
+        with self.conexao:
+            self.conexao.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (chave, valor))
+
+    def carregar(self):
+        """Monta as coleções no mesmo formato dos arquivos JSON"""
+        dados = {colecao: {} for colecao in COLECOES}
+
+        for rid, nome, total in self.conexao.execute("SELECT id, nome, total FROM recrutadores"):
+            dados["recrutadores"][rid] = {"nome": nome, "total": total}
+
+        for r_id, nome, recrutador_id, pago, data, ts in self.conexao.execute(
+            "SELECT id, nome, recrutador_id, pago, data, ts FROM recrutas"
+        ):
+            dados["recrutas"][r_id] = {
+                "nome": nome,
+                "recrutador_id": recrutador_id,
+                "pago": bool(pago),
+                "data": data
+            }
+            if ts:
+                dados["recrutas"][r_id]["ts"] = ts
+
+        for mes, rid, total in self.conexao.execute("SELECT mes, recrutador_id, total FROM historico_mensal"):
+            dados["historico_mensal"].setdefault(mes, {})[rid] = total
+
+        for rid, maior_mes, mes, nome in self.conexao.execute(
+            "SELECT recrutador_id, maior_mes, mes, nome FROM recordes"
+        ):
+            dados["recordes"][rid] = {"maior_mes": maior_mes, "mes": mes, "nome": nome}
+
+        return dados
+
+    def salvar(self, dados, alteracoes=None):
+        """Grava só as linhas alteradas (tudo se alteracoes=None) numa única transação"""
+        with self.conexao:
+            if alteracoes is None:
+                for colecao in COLECOES:
+                    self.conexao.execute(f"DELETE FROM {colecao}")
+                alteracoes = {colecao: dados[colecao].keys() for colecao in COLECOES}
+
+            for chave in alteracoes.get("recrutadores", ()):
+                dados_rec = dados["recrutadores"].get(chave)
+                if dados_rec is None:
+                    self.conexao.execute("DELETE FROM recrutadores WHERE id = ?", (chave,))
+                else:
+                    self.conexao.execute(
+                        "INSERT OR REPLACE INTO recrutadores (id, nome, total) VALUES (?, ?, ?)",
+                        (chave, dados_rec["nome"], dados_rec["total"])
+                    )
+
+            for chave in alteracoes.get("recrutas", ()):
+                recruta = dados["recrutas"].get(chave)
+                if recruta is None:
+                    self.conexao.execute("DELETE FROM recrutas WHERE id = ?", (chave,))
+                else:
+                    self.conexao.execute(
+                        "INSERT OR REPLACE INTO recrutas (id, nome, recrutador_id, pago, data, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                        (chave, recruta["nome"], recruta["recrutador_id"], int(recruta["pago"]), recruta["data"],
+                         recruta.get("ts", 0))
+                    )
+
+            for mes in alteracoes.get("historico_mensal", ()):
+                self.conexao.execute("DELETE FROM historico_mensal WHERE mes = ?", (mes,))
+                for rid, total in dados["historico_mensal"].get(mes, {}).items():
+                    self.conexao.execute(
+                        "INSERT INTO historico_mensal (mes, recrutador_id, total) VALUES (?, ?, ?)",
+                        (mes, rid, total)
+                    )
+
+            for chave in alteracoes.get("recordes", ()):
+                recorde = dados["recordes"].get(chave)
+                if recorde is None:
+                    self.conexao.execute("DELETE FROM recordes WHERE recrutador_id = ?", (chave,))
+                else:
+                    self.conexao.execute(
+                        "INSERT OR REPLACE INTO recordes (recrutador_id, maior_mes, mes, nome) VALUES (?, ?, ?, ?)",
+                        (chave, recorde["maior_mes"], recorde["mes"], recorde["nome"])
+                    )
+
+    def registrar_evento(self, evento):
+        pass
+
+    def fechar(self):
+        self.conexao.close()
+
+# ========== JOURNAL ==========
+class ArmazenamentoJournal:
+    """Eventos em um journal JSONL só de acréscimo + snapshot periódico
+
+    Cada alteração vira uma linha no journal (O(1)); ao carregar, o estado é o
+    último snapshot mais os eventos posteriores a ele. Ao compactar, o journal
+    antigo é arquivado com o número do snapshot, preservando o histórico.
+    """
+
+    def __init__(self, caminho_journal, caminho_snapshot, compactar_a_cada=1000):
+        self.caminho_journal = caminho_journal
+        self.caminho_snapshot = caminho_snapshot
+        self.compactar_a_cada = compactar_a_cada
+        self.seq = 0
+        self.eventos_desde_snapshot = 0
+        self.arquivo = None
+
+    def carregar(self):
+        """Lê o snapshot e devolve junto os eventos do journal que vieram depois dele"""
+        dados = {colecao: {} for colecao in COLECOES}
+        seq_snapshot = 0
+        if os.path.exists(self.caminho_snapshot):
+            with open(self.caminho_snapshot, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            seq_snapshot = snapshot.get("seq", 0)
+            for colecao in COLECOES:
+                dados[colecao] = snapshot.get(colecao, {})
+
+        eventos = []
+        if os.path.exists(self.caminho_journal):
+            with open(self.caminho_journal, 'r', encoding='utf-8') as f:
+                for linha in f:
+                    try:
+                        evento = json.loads(linha)
+                    except json.JSONDecodeError:
+                        # Última linha cortada por uma queda no meio da escrita
+                        print("⚠️ Linha inválida ignorada no journal de recrutamento")
+                        continue
+                    if evento.get("seq", 0) > seq_snapshot:
+                        eventos.append(evento)
+
+        self.seq = eventos[-1]["seq"] if eventos else seq_snapshot
+        self.eventos_desde_snapshot = len(eventos)
+        dados["eventos"] = eventos
+        return dados
+
+    def registrar_evento(self, evento):
+        """Acrescenta o evento ao journal"""
+        if self.arquivo is None:
+            self.arquivo = open(self.caminho_journal, 'a', encoding='utf-8')
+
+        self.seq += 1
+        evento["seq"] = self.seq
+        self.arquivo.write(json.dumps(evento, ensure_ascii=False) + "\n")
+        self.arquivo.flush()
+        self.eventos_desde_snapshot += 1
+
+    def salvar(self, dados, alteracoes=None):
+        """Eventos já estão no journal; só compacta quando pedido ou quando ele cresce demais"""
+        if alteracoes is None or self.eventos_desde_snapshot >= self.compactar_a_cada:
+            self.compactar(dados)
+
+    def compactar(self, dados):
+        """Grava um snapshot do estado atual e arquiva o journal que ele cobre"""
+        snapshot = {colecao: dados[colecao] for colecao in COLECOES}
+        snapshot["seq"] = self.seq
+        gravar_json_atomico(self.caminho_snapshot, snapshot)
+
+        if self.arquivo is not None:
+            self.arquivo.close()
+            self.arquivo = None
+
+        if os.path.exists(self.caminho_journal) and self.eventos_desde_snapshot:
+            base, extensao = os.path.splitext(self.caminho_journal)
+            os.replace(self.caminho_journal, f"{base}.{self.seq}{extensao}")
+
+        self.eventos_desde_snapshot = 0
+        print(f"🗜️ Journal de recrutamento compactado (seq {self.seq})")
+
+    def fechar(self):
+        if self.arquivo is not None:
+            self.arquivo.close()
+            self.arquivo = None
+
+# ========== MIGRAÇÃO ==========
+def migrar_json_para_sqlite(arquivos, caminho_banco, banco=None):
+    """Importa os arquivos JSON antigos para o SQLite (executa uma única vez)"""
+    fechar_depois = banco is None
+    if banco is None:
+        banco = ArmazenamentoSQLite(caminho_banco)
+
+    try:
+        if banco.get_meta("migrado_json"):
+            return False
+
+        json_existente = [c for c in COLECOES if os.path.exists(arquivos[c])]
+        if json_existente:
+            dados = ArmazenamentoJSON(arquivos).carregar()
+            banco.salvar(dados)
+            print(
+                f"✅ Migração JSON → SQLite: {len(dados['recrutadores'])} recrutadores, "
+                f"{len(dados['recrutas'])} recrutas, {len(dados['historico_mensal'])} meses, "
+                f"{len(dados['recordes'])} recordes"
+            )
+
+        banco.set_meta("migrado_json", "1")
+        return bool(json_existente)
+    finally:
+        if fechar_depois:
+            banco.fechar()
+
+def migrar_json_para_journal(arquivos, journal):
+    """Usa os arquivos JSON antigos como snapshot inicial do journal (uma única vez)"""
+    if os.path.exists(journal.caminho_snapshot) or os.path.exists(journal.caminho_journal):
+        return False
+
+    if not any(os.path.exists(arquivos[c]) for c in COLECOES):
+        return False
+
+    journal.compactar(ArmazenamentoJSON(arquivos).carregar())
+    print("✅ Migração JSON → journal concluída")
+    return True
+
+def criar_armazenamento(motor, arquivos, caminho_banco, caminho_journal=None, caminho_snapshot=None):
+    """Cria o motor de armazenamento configurado ('json', 'sqlite' ou 'journal')"""
+    if motor == "sqlite":
+        banco = ArmazenamentoSQLite(caminho_banco)
+        migrar_json_para_sqlite(arquivos, caminho_banco, banco)
+        return banco
+    if motor == "journal":
+        journal = ArmazenamentoJournal(caminho_journal, caminho_snapshot)
+        migrar_json_para_journal(arquivos, journal)
+        return journal
+    return ArmazenamentoJSON(arquivos)
+
+if __name__ == "__main__":
+    from modules.painel_rec import ARQUIVOS_RECRUTAMENTO, ARQUIVO_BANCO
+    migrar_json_para_sqlite(ARQUIVOS_RECRUTAMENTO, ARQUIVO_BANCO)
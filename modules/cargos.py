@@ -4,6 +4,7 @@ from discord import ui, ButtonStyle
 import asyncio
 from datetime import datetime
 import re
+from modules.indice_fivem import buscar_membro_por_fivem
 
 # ========== CONFIGURAÇÃO SIMPLES (IGUAL AO BASE) ==========
 NICKNAME_CONFIG = {
@@ -94,13 +95,7 @@ def member_tem_cargo_flexivel(member, nome_cargo):
 # ========== FUNÇÕES AUXILIARES (IGUAL AO BASE) ==========
 def buscar_usuario_por_fivem_id(guild: discord.Guild, fivem_id: str) -> discord.Member:
     """Busca usuário pelo ID do FiveM no nickname"""
-    for member in guild.members:
-        if member.nick:
-            # Padrão: " | 123456" no final
-            if member.nick.endswith(f" | {fivem_id}"):
-                return member
-    
-    return None
+    return buscar_membro_por_fivem(guild, fivem_id)
 
 def extrair_parte_nickname(nickname: str):
     """Extrai a parte do nome do usuário (segunda parte após o primeiro ' | ')"""
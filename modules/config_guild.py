@@ -0,0 +1,96 @@
+import atexit
+import json
+import os
+import time
+from modules.armazenamento_rec import GravacaoAgrupada, gravar_json_atomico
+
+# ========== CONFIGURAÇÃO ==========
+ARQUIVO_CONFIG = "config_guilds.json"
+INTERVALO_GRAVACAO_CONFIG = float(os.getenv("CONFIG_INTERVALO_GRAVACAO", "1"))
+
+# Arquivos antigos (um por módulo) importados na primeira leitura
+ARQUIVOS_LEGADOS = {
+    "painel_rec": "paineis_rec.json",
+    "painel_hierarquia": "paineis_hierarquia.json",
+}
+
+# ========== CONFIGURAÇÃO POR GUILD ==========
+class ConfigGuilds:
+    """Canais e mensagens que cada módulo usa em cada guild, num único arquivo
+
+    Organizado por chave ({chave: {guild_id: valor}}), para que cada módulo
+    possa percorrer as guilds que configurou. O arquivo é lido no primeiro
+    acesso e as leituras vêm da memória. Alterações só marcam a configuração
+    como suja: uma gravação agrupada é agendada e feita numa thread, então o
+    event loop nunca espera o disco.
+    """
+
+    def __init__(self, arquivo=ARQUIVO_CONFIG, intervalo=INTERVALO_GRAVACAO_CONFIG):
+        self.arquivo = arquivo
+        self.dados = None  # carregado no primeiro acesso
+        self.gravacao = GravacaoAgrupada(arquivo, lambda: self.dados, intervalo)
+
+    # ---------- Leitura ----------
+    def _carregar(self):
+        if self.dados is not None:
+            return self.dados
+
+        inicio = time.perf_counter()
+        self.dados = {}
+        try:
+            if os.path.exists(self.arquivo):
+                with open(self.arquivo, 'r', encoding='utf-8') as f:
+                    self.dados = json.load(f)
+            else:
+                self._importar_legados()
+        except Exception as e:
+            print(f"❌ Erro ao carregar {self.arquivo}: {e}")
+
+        print(f"✅ Configuração das guilds carregada ({(time.perf_counter() - inicio) * 1000:.1f}ms)")
+        return self.dados
+
+    def _importar_legados(self):
+        """Traz os arquivos antigos de cada módulo para a configuração (uma única vez)"""
+        importados = []
+        for chave, arquivo in ARQUIVOS_LEGADOS.items():
+            if os.path.exists(arquivo):
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    self.dados[chave] = json.load(f)
+                importados.append(arquivo)
+
+        if importados:
+            # Gravação síncrona: os arquivos antigos só saem depois que a configuração está em disco
+            gravar_json_atomico(self.arquivo, self.dados)
+            for arquivo in importados:
+                os.replace(arquivo, f"{arquivo}.legado")
+            print(f"📦 Configuração importada de: {', '.join(importados)}")
+
+    def secao(self, chave):
+        """{guild_id: valor} de uma chave (dicionário vivo; depois de alterar, chame salvar())"""
+        return self._carregar().setdefault(chave, {})
+
+    def get(self, guild_id, chave, padrao=None):
+        return self.secao(chave).get(str(guild_id), padrao)
+
+    # ---------- Escrita ----------
+    def definir(self, guild_id, chave, valor):
+        self.secao(chave)[str(guild_id)] = valor
+        self.salvar()
+
+    def remover(self, guild_id, chave):
+        valor = self.secao(chave).pop(str(guild_id), None)
+        if valor is not None:
+            self.salvar()
+        return valor
+
+    def salvar(self):
+        """Marca a configuração como alterada e agenda uma gravação agrupada"""
+        self.gravacao.salvar()
+
+    def descarregar(self):
+        """Grava alterações pendentes na hora (encerramento do bot)"""
+        if self.dados is not None:
+            self.gravacao.descarregar()
+
+config = ConfigGuilds()
+atexit.register(config.descarregar)
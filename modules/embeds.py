@@ -0,0 +1,145 @@
+import discord
+import hashlib
+import json
+
+# ========== LIMITES DO DISCORD ==========
+LIMITE_TITULO = 256
+LIMITE_DESCRICAO = 4096
+LIMITE_VALOR_CAMPO = 1024
+LIMITE_CAMPOS = 25
+LIMITE_TOTAL = 6000  # soma dos textos de todos os embeds de uma mensagem
+LIMITE_EMBEDS = 10  # embeds por mensagem
+NOME_CAMPO_VAZIO = "\u200b"
+
+# ========== HASH DE CONTEÚDO ==========
+def hash_embeds(embeds, ignorar=("timestamp",)):
+    """Hash do conteúdo serializado dos embeds de uma mensagem
+
+    As chaves em `ignorar` (ex: horário da renderização) ficam de fora, para
+    que dois renders com o mesmo conteúdo tenham o mesmo hash.
+    """
+    conteudo = []
+    for embed in embeds:
+        dados = embed.to_dict()
+        for chave in ignorar:
+            dados.pop(chave, None)
+        conteudo.append(dados)
+
+    serializado = json.dumps(conteudo, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(serializado.encode("utf-8")).hexdigest()
+
+def nova_estatistica_api():
+    """Contadores de chamadas à API de um painel (exibidos no !status)"""
+    return {"enviadas": 0, "ignoradas": 0}
+
+# ========== LAYOUT ==========
+def tamanho_embed(embed):
+    """Caracteres que contam para o limite de 6000 (título, descrição, campos, rodapé e autor)"""
+    total = len(embed.title or "") + len(embed.description or "")
+    for campo in embed.fields:
+        total += len(campo.name or "") + len(campo.value or "")
+    if embed.footer and embed.footer.text:
+        total += len(embed.footer.text)
+    if embed.author and embed.author.name:
+        total += len(embed.author.name)
+    return total
+
+def consumir_itens(itens, inicio, limite, separador=" "):
+    """Junta itens a partir de `inicio` num texto de até `limite` caracteres sem cortar
+    nenhum item (retorna o texto e o índice do próximo item)"""
+    texto = itens[inicio][:LIMITE_VALOR_CAMPO]
+    posicao = inicio + 1
+    while posicao < len(itens) and len(texto) + len(separador) + len(itens[posicao]) <= limite:
+        texto += separador + itens[posicao]
+        posicao += 1
+    return texto, posicao
+
+def agrupar_em_mensagens(embeds):
+    """Divide os embeds em mensagens de no máximo 10 embeds e 6000 caracteres"""
+    mensagens = []
+    atual = []
+    tamanho = 0
+    for embed in embeds:
+        tamanho_atual = tamanho_embed(embed)
+        if atual and (len(atual) >= LIMITE_EMBEDS or tamanho + tamanho_atual > LIMITE_TOTAL):
+            mensagens.append(atual)
+            atual = []
+            tamanho = 0
+        atual.append(embed)
+        tamanho += tamanho_atual
+    if atual:
+        mensagens.append(atual)
+    return mensagens
+
+class LayoutEmbeds:
+    """Distribui seções com listas longas (ex: menções) respeitando os limites do Discord
+
+    Os itens de cada campo viram valores de até 1024 caracteres, e cada valor é
+    cortado também no espaço que ainda resta na mensagem (6000 caracteres / 10
+    embeds), então as mensagens saem cheias. Os campos vão para embeds de até 25
+    campos, e agrupar_em_mensagens chega nas mesmas quebras ao dividir o
+    resultado de montar().
+    """
+
+    def __init__(self, sufixo_continuacao=" (continuação)"):
+        self.sufixo_continuacao = sufixo_continuacao
+        self.embeds = []
+        self.embed = None
+        self.titulo = ""
+        self.cor = None
+        self.pendente = None  # seção aberta que ainda não recebeu campos
+        self.tamanho_mensagem = 0
+        self.embeds_mensagem = 0
+
+    def _novo_embed(self, titulo, descricao=None, rodape=None, reserva=0):
+        """Abre um embed; `reserva` é o tamanho do primeiro campo que vai entrar nele"""
+        titulo = titulo[:LIMITE_TITULO]
+        descricao = descricao[:LIMITE_DESCRICAO] if descricao else None
+        tamanho = len(titulo) + len(descricao or "") + len(rodape or "")
+        if self.embeds_mensagem >= LIMITE_EMBEDS or self.tamanho_mensagem + tamanho + reserva > LIMITE_TOTAL:
+            self.tamanho_mensagem = 0
+            self.embeds_mensagem = 0
+
+        self.embed = discord.Embed(title=titulo, description=descricao, color=self.cor)
+        if rodape:
+            self.embed.set_footer(text=rodape)
+        self.embeds.append(self.embed)
+        self.tamanho_mensagem += tamanho
+        self.embeds_mensagem += 1
+
+    def _abrir_pendente(self, reserva=0):
+        if self.pendente:
+            titulo, descricao, rodape = self.pendente
+            self.pendente = None
+            self._novo_embed(titulo, descricao, rodape, reserva)
+
+    def secao(self, titulo, cor, descricao=None, rodape=None):
+        """Começa uma nova seção (o embed só é criado quando o tamanho do primeiro campo é conhecido)"""
+        self._abrir_pendente()
+        self.titulo = titulo
+        self.cor = cor
+        self.pendente = (titulo, descricao, rodape)
+
+    def campo(self, nome, itens, vazio, separador=" "):
+        """Adiciona um campo cujo valor são os itens; se não couber, continua em outros campos/embeds"""
+        itens = list(itens) or [vazio]
+        posicao = 0
+        while posicao < len(itens):
+            nome_campo = nome if posicao == 0 else NOME_CAMPO_VAZIO
+            
+            # Garante um embed com espaço para pelo menos o próximo item
+            minimo = len(nome_campo) + len(itens[posicao][:LIMITE_VALOR_CAMPO])
+            if self.pendente:
+                self._abrir_pendente(minimo)
+            elif len(self.embed.fields) >= LIMITE_CAMPOS or self.tamanho_mensagem + minimo > LIMITE_TOTAL:
+                self._novo_embed(f"{self.titulo}{self.sufixo_continuacao}", reserva=minimo)
+            
+            limite = min(LIMITE_VALOR_CAMPO, LIMITE_TOTAL - self.tamanho_mensagem - len(nome_campo))
+            valor, posicao = consumir_itens(itens, posicao, limite, separador)
+            self.embed.add_field(name=nome_campo, value=valor, inline=False)
+            self.tamanho_mensagem += len(nome_campo) + len(valor)
+
+    def montar(self):
+        """Lista final de embeds (em ordem, prontos para agrupar_em_mensagens)"""
+        self._abrir_pendente()
+        return self.embeds
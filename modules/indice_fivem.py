@@ -0,0 +1,136 @@
+import discord
+from discord.ext import commands
+
+# ========== ÍNDICE ID FIVEM → MEMBRO ==========
+def id_fivem_do_nick(nick):
+    """ID do FiveM no nickname ("PREFIXO | NOME | ID" → "ID"), ou None"""
+    if not nick or " | " not in nick:
+        return None
+    return nick.rsplit(" | ", 1)[1]
+
+class IndiceFivem:
+    """ID do FiveM (final do nickname) → membros de uma guild
+
+    Montado uma vez a partir dos nicknames e atualizado pelos eventos de
+    membro. Um ID com mais de um membro é um ID duplicado.
+    """
+
+    def __init__(self):
+        self.membros_por_id = {}  # {fivem_id: set(member_id)}
+        self.id_do_membro = {}  # {member_id: fivem_id}
+
+    def construir(self, guild):
+        self.membros_por_id = {}
+        self.id_do_membro = {}
+        for member in guild.members:
+            self.atualizar(member)
+
+    def atualizar(self, member):
+        """Reindexa o membro pelo nickname atual"""
+        novo = id_fivem_do_nick(member.nick)
+        antigo = self.id_do_membro.get(member.id)
+        if novo == antigo:
+            return
+
+        self.remover(member.id)
+        if novo:
+            self.membros_por_id.setdefault(novo, set()).add(member.id)
+            self.id_do_membro[member.id] = novo
+
+    def remover(self, member_id):
+        antigo = self.id_do_membro.pop(member_id, None)
+        if antigo:
+            membros = self.membros_por_id[antigo]
+            membros.discard(member_id)
+            if not membros:
+                del self.membros_por_id[antigo]
+
+    def buscar(self, fivem_id):
+        """IDs dos membros que usam o ID do FiveM"""
+        return self.membros_por_id.get(str(fivem_id), set())
+
+    def duplicados(self):
+        """{fivem_id: set(member_id)} dos IDs usados por mais de um membro"""
+        return {fivem_id: membros for fivem_id, membros in self.membros_por_id.items() if len(membros) > 1}
+
+indices = {}  # {guild_id: IndiceFivem}
+
+def get_indice_fivem(guild):
+    """Índice da guild (montado no primeiro acesso)"""
+    indice = indices.get(guild.id)
+    if indice is None:
+        indice = IndiceFivem()
+        indice.construir(guild)
+        indices[guild.id] = indice
+    return indice
+
+def buscar_membro_por_fivem(guild, fivem_id):
+    """Membro que usa o ID do FiveM no nickname (None se ninguém usa)"""
+    for member_id in sorted(get_indice_fivem(guild).buscar(fivem_id)):
+        member = guild.get_member(member_id)
+        if member:
+            return member
+    return None
+
+# ========== COG ==========
+class IndiceFivemCog(commands.Cog, name="IndiceFivem"):
+    """Mantém o índice de IDs do FiveM atualizado"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        print("✅ Módulo IndiceFivem carregado!")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # (Re)monta os índices: depois de uma reconexão o cache de membros pode ter mudado
+        indices.clear()
+        for guild in self.bot.guilds:
+            get_indice_fivem(guild)
+        print(f"✅ Índice de IDs FiveM montado ({sum(len(i.id_do_membro) for i in indices.values())} membros com ID)")
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.nick != after.nick and after.guild.id in indices:
+            indices[after.guild.id].atualizar(after)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        if member.guild.id in indices:
+            indices[member.guild.id].atualizar(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        if member.guild.id in indices:
+            indices[member.guild.id].remover(member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        indices.pop(guild.id, None)
+
+    @commands.command(name="ids_duplicados", aliases=["duplicados"])
+    @commands.has_permissions(administrator=True)
+    async def ids_duplicados(self, ctx):
+        """🔁 Lista IDs do FiveM usados por mais de um membro"""
+        duplicados = get_indice_fivem(ctx.guild).duplicados()
+
+        if not duplicados:
+            await ctx.send("✅ Nenhum ID do FiveM duplicado!")
+            return
+
+        embed = discord.Embed(
+            title="🔁 IDs do FiveM Duplicados",
+            description=f"Total: **{len(duplicados)}** IDs",
+            color=discord.Color.orange()
+        )
+
+        for fivem_id, membros in sorted(duplicados.items())[:25]:
+            embed.add_field(
+                name=f"ID `{fivem_id}`",
+                value=" ".join(f"<@{member_id}>" for member_id in sorted(membros))[:1024],
+                inline=False
+            )
+
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(IndiceFivemCog(bot))
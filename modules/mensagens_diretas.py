@@ -0,0 +1,134 @@
+import discord
+from discord.ext import commands
+import asyncio
+import os
+import random
+import time
+
+# ========== CONFIGURAÇÃO ==========
+TAMANHO_FILA_DM = int(os.getenv("DM_TAMANHO_FILA", "500"))
+TRABALHADORES_DM = int(os.getenv("DM_TRABALHADORES", "2"))
+TENTATIVAS_DM = 5
+ESPERA_BASE_DM = 1.0  # segundos; dobra a cada tentativa (429 / erro 5xx)
+ESPERA_MAXIMA_DM = 60.0
+VALIDADE_DM_FECHADA = 6 * 3600  # segundos sem tentar de novo quem está com a DM fechada
+
+# ========== DESPACHANTE DE DMs ==========
+class DespachanteDM:
+    """Fila de DMs enviadas em segundo plano
+
+    Quem chama só enfileira (nunca espera o Discord). Os trabalhadores tentam
+    de novo com espera exponencial em 429 e erros 5xx. Usuários com a DM
+    fechada (Forbidden) vão para uma lista de descarte e as próximas DMs
+    para eles são ignoradas até a entrada expirar.
+    """
+
+    def __init__(self, tamanho_fila=TAMANHO_FILA_DM, trabalhadores=TRABALHADORES_DM):
+        self.tamanho_fila = tamanho_fila
+        self.total_trabalhadores = trabalhadores
+        self.fila = None  # criada no event loop (iniciar)
+        self.trabalhadores = []
+        self.dm_fechada = {}  # {user_id: momento do Forbidden}
+        self.estatisticas = {"enviadas": 0, "falhas": 0, "ignoradas": 0, "novas_tentativas": 0}
+
+    def iniciar(self):
+        if self.trabalhadores:
+            return
+        self.fila = asyncio.Queue(maxsize=self.tamanho_fila)
+        self.trabalhadores = [asyncio.create_task(self._trabalhador()) for _ in range(self.total_trabalhadores)]
+
+    def parar(self):
+        for trabalhador in self.trabalhadores:
+            trabalhador.cancel()
+        self.trabalhadores = []
+        if self.fila and self.fila.qsize():
+            print(f"⚠️ {self.fila.qsize()} DMs na fila descartadas ao parar")
+        self.fila = None
+
+    def enviar(self, member, **mensagem):
+        """Enfileira uma DM (argumentos de member.send); False se foi ignorada"""
+        fechada_em = self.dm_fechada.get(member.id)
+        if fechada_em is not None:
+            if time.monotonic() - fechada_em < VALIDADE_DM_FECHADA:
+                self.estatisticas["ignoradas"] += 1
+                return False
+            del self.dm_fechada[member.id]
+
+        self.iniciar()
+        try:
+            self.fila.put_nowait((member, mensagem))
+            return True
+        except asyncio.QueueFull:
+            self.estatisticas["ignoradas"] += 1
+            print(f"⚠️ Fila de DMs cheia ({self.tamanho_fila}), DM para {member} ignorada")
+            return False
+
+    async def _trabalhador(self):
+        # Referência local: parar() descarta self.fila enquanto o trabalhador é cancelado
+        fila = self.fila
+        while True:
+            member, mensagem = await fila.get()
+            try:
+                await self._entregar(member, mensagem)
+            except Exception as e:
+                self.estatisticas["falhas"] += 1
+                print(f"❌ Erro ao enviar DM para {member}: {e}")
+            finally:
+                fila.task_done()
+
+    async def _entregar(self, member, mensagem):
+        for tentativa in range(TENTATIVAS_DM):
+            try:
+                await member.send(**mensagem)
+                self.estatisticas["enviadas"] += 1
+                return
+            except discord.Forbidden:
+                # DM fechada / bloqueou o bot: não adianta tentar de novo
+                self.dm_fechada[member.id] = time.monotonic()
+                self.estatisticas["falhas"] += 1
+                return
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    raise
+
+            if tentativa + 1 < TENTATIVAS_DM:
+                self.estatisticas["novas_tentativas"] += 1
+                espera = min(ESPERA_MAXIMA_DM, ESPERA_BASE_DM * 2 ** tentativa)
+                await asyncio.sleep(espera * random.uniform(0.5, 1.0))
+
+        self.estatisticas["falhas"] += 1
+        print(f"⚠️ DM para {member} desistida após {TENTATIVAS_DM} tentativas")
+
+    def resumo(self):
+        """Texto dos contadores (exibido no !status)"""
+        na_fila = self.fila.qsize() if self.fila else 0
+        return (
+            f"{self.estatisticas['enviadas']} enviadas • {self.estatisticas['falhas']} falhas • "
+            f"{self.estatisticas['ignoradas']} ignoradas\n"
+            f"{na_fila} na fila • {self.estatisticas['novas_tentativas']} novas tentativas • "
+            f"{len(self.dm_fechada)} com DM fechada"
+        )
+
+despachante = DespachanteDM()
+
+def enviar_dm(member, **mensagem):
+    """Envia a DM em segundo plano (não espera o Discord nem levanta erro)"""
+    return despachante.enviar(member, **mensagem)
+
+# ========== COG ==========
+class MensagensDiretasCog(commands.Cog, name="MensagensDiretas"):
+    """Liga e desliga os trabalhadores da fila de DMs junto com o módulo"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.despachante = despachante
+        print("✅ Módulo MensagensDiretas carregado!")
+
+    async def cog_load(self):
+        self.despachante.iniciar()
+
+    def cog_unload(self):
+        self.despachante.parar()
+
+async def setup(bot):
+    await bot.add_cog(MensagensDiretasCog(bot))
@@ -2,13 +2,22 @@ import discord
 from discord.ext import commands
 from discord import ui, ButtonStyle
 import asyncio
+from collections import Counter
 from datetime import datetime
-import json
 import os
 import re
+from modules.agendador import AgendadorAtualizacao
+from modules.config_guild import config
+from modules.embeds import LayoutEmbeds, agrupar_em_mensagens, hash_embeds, nova_estatistica_api
+from modules.restauracao import restaurar_paineis
 
 # ========== CONFIGURAÇÃO ==========
-ARQUIVO_PAINEIS = "paineis_hierarquia.json"
+TITULOS_PAINEL = ["LIDERANÇA", "GERÊNCIA", "SUPERVISÃO", "ELITES", "MEMBROS", "TOTAL"]
+
+# Rajadas de eventos (raid de entradas, cargo dado em massa) viram uma só atualização:
+# espera SILENCIO segundos sem eventos, mas no máximo LATENCIA_MAXIMA desde o primeiro
+SILENCIO_ATUALIZACAO = float(os.getenv("HIERARQUIA_SILENCIO", "3"))
+LATENCIA_MAXIMA_ATUALIZACAO = float(os.getenv("HIERARQUIA_LATENCIA_MAXIMA", "15"))
 
 CARGOS_REAIS = [
     {"nome": "👑 | Lider | 00", "display": "Lider 00", "emoji": "👑", "prioridade": 1},
@@ -27,6 +36,15 @@ CARGOS_REAIS = [
     {"nome": "🙅‍♂️ | Membro", "display": "Membro", "emoji": "👤", "prioridade": 14},
 ]
 
+# (título, cor, índices em CARGOS_REAIS) de cada seção do painel
+SECOES_HIERARQUIA = [
+    ("👑 **LIDERANÇA**", discord.Color.gold(), [0, 1, 2, 3]),
+    ("📊 **GERÊNCIA**", discord.Color.blue(), [4, 5, 6, 7]),
+    ("🔍 **SUPERVISÃO**", discord.Color.green(), [8, 9]),
+    ("👑 **ELITES**", discord.Color.purple(), [10, 11, 12]),
+    ("**MEMBROS:**", discord.Color.light_grey(), [13]),
+]
+
 def normalizar_para_comparacao(texto: str) -> str:
     if not texto:
         return ""
@@ -34,60 +52,59 @@ def normalizar_para_comparacao(texto: str) -> str:
     texto_limpo = re.sub(r'\s+', '', texto_limpo)
     return texto_limpo.lower()
 
-def encontrar_cargo_mais_alto(member, cargos_config):
-    """Encontra o CARGO MAIS ALTO do membro baseado na prioridade"""
-    cargos_membro = []
+def classificar_cargo(role, cargos_config):
+    """Retorna o cargo da hierarquia que corresponde a um cargo do Discord (ou None)"""
+    if role.name == "@everyone":
+        return None
+        
+    role_nome = role.name.lower()
     
-    for role in member.roles:
-        if role.name == "@everyone":
-            continue
-            
-        role_nome = role.name.lower()
+    # VERIFICAÇÃO ESPECÍFICA PARA ELITES
+    if "ceo" in role_nome and "elite" in role_nome:
+        return {
+            "display": "Ceo Elite",
+            "emoji": "👑",
+            "prioridade": 11
+        }
         
-        # VERIFICAÇÃO ESPECÍFICA PARA ELITES
-        if "ceo" in role_nome and "elite" in role_nome:
-            cargos_membro.append({
-                "display": "Ceo Elite",
-                "emoji": "👑",
-                "prioridade": 11
-            })
-            continue
-            
-        if "sub" in role_nome and "elite" in role_nome:
-            cargos_membro.append({
-                "display": "Sub Elite",
-                "emoji": "⭐",
-                "prioridade": 12
-            })
+    if "sub" in role_nome and "elite" in role_nome:
+        return {
+            "display": "Sub Elite",
+            "emoji": "⭐",
+            "prioridade": 12
+        }
+        
+    if "elite" in role_nome and "sub" not in role_nome and "ceo" not in role_nome:
+        return {
+            "display": "Elite",
+            "emoji": "✨",
+            "prioridade": 13
+        }
+    
+    # Para os outros cargos
+    role_normalizado = normalizar_para_comparacao(role.name)
+    
+    for cargo_info in cargos_config:
+        if cargo_info["display"] in ["Ceo Elite", "Sub Elite", "Elite"]:
             continue
             
-        if "elite" in role_nome and "sub" not in role_nome and "ceo" not in role_nome:
-            cargos_membro.append({
-                "display": "Elite",
-                "emoji": "✨",
-                "prioridade": 13
-            })
-            continue
-        
-        # Para os outros cargos
-        role_normalizado = normalizar_para_comparacao(role.name)
+        cargo_normalizado = normalizar_para_comparacao(cargo_info["nome"])
         
-        for cargo_info in cargos_config:
-            if cargo_info["display"] in ["Ceo Elite", "Sub Elite", "Elite"]:
-                continue
-                
-            cargo_normalizado = normalizar_para_comparacao(cargo_info["nome"])
+        if (role_normalizado == cargo_normalizado or 
+            cargo_normalizado in role_normalizado or 
+            role_normalizado in cargo_normalizado):
             
-            if (role_normalizado == cargo_normalizado or 
-                cargo_normalizado in role_normalizado or 
-                role_normalizado in cargo_normalizado):
-                
-                cargos_membro.append({
-                    "display": cargo_info["display"],
-                    "emoji": cargo_info["emoji"],
-                    "prioridade": cargo_info["prioridade"]
-                })
-                break
+            return {
+                "display": cargo_info["display"],
+                "emoji": cargo_info["emoji"],
+                "prioridade": cargo_info["prioridade"]
+            }
+    
+    return None
+
+def encontrar_cargo_mais_alto(member, cargos_config):
+    """Encontra o CARGO MAIS ALTO do membro baseado na prioridade"""
+    cargos_membro = [cargo for cargo in (classificar_cargo(role, cargos_config) for role in member.roles) if cargo]
     
     if not cargos_membro:
         return None
@@ -95,6 +112,127 @@ def encontrar_cargo_mais_alto(member, cargos_config):
     cargos_membro.sort(key=lambda x: x["prioridade"])
     return cargos_membro[0]
 
+# ========== ÍNDICE DE HIERARQUIA ==========
+CARGOS_POR_PRIORIDADE = {cargo["prioridade"]: cargo for cargo in CARGOS_REAIS}
+
+class ResolvedorCargos:
+    """Mapa role_id → prioridade na hierarquia, montado a partir dos cargos da guild
+    
+    Toda a comparação de nomes acontece ao montar; depois o cargo mais alto de
+    um membro é só o menor valor entre os IDs dos cargos dele.
+    """
+    
+    def __init__(self):
+        self.prioridades = {}  # {role_id: prioridade} só dos cargos que pertencem à hierarquia
+    
+    def construir(self, guild):
+        """Reclassifica todos os cargos da guild (retorna True se o mapa mudou)"""
+        prioridades = {}
+        for role in guild.roles:
+            cargo = classificar_cargo(role, CARGOS_REAIS)
+            if cargo:
+                prioridades[role.id] = cargo["prioridade"]
+        
+        mudou = prioridades != self.prioridades
+        self.prioridades = prioridades
+        return mudou
+    
+    def prioridade(self, role_id):
+        """Prioridade do cargo (None se não for cargo da hierarquia)"""
+        return self.prioridades.get(role_id)
+    
+    def cargo_mais_alto(self, member):
+        """Mesmo resultado de encontrar_cargo_mais_alto, sem comparar nomes"""
+        prioridades = [self.prioridades[role.id] for role in member.roles if role.id in self.prioridades]
+        return CARGOS_POR_PRIORIDADE[min(prioridades)] if prioridades else None
+
+class IndiceHierarquia:
+    """Membros de uma guild agrupados pelo cargo mais alto da hierarquia
+    
+    Montado uma vez e depois corrigido pelos eventos de membro: uma mudança
+    de cargos só olha os cargos que entraram/saíram.
+    """
+    
+    def __init__(self, resolvedor):
+        self.resolvedor = resolvedor
+        self.limpar()
+    
+    def limpar(self):
+        self.membros_por_cargo = {cargo["display"]: set() for cargo in CARGOS_REAIS}
+        self.prioridades_membro = {}  # {member_id: Counter({prioridade: qtd de cargos do membro})}
+        self.cargo_membro = {}  # {member_id: display do cargo mais alto}
+    
+    def construir(self, guild):
+        """Monta o índice percorrendo os membros da guild (uma vez)"""
+        self.limpar()
+        for member in guild.members:
+            self.adicionar_membro(member)
+    
+    def adicionar_membro(self, member):
+        """Indexa um membro (retorna True se ele aparece na hierarquia)"""
+        if member.bot:
+            return False
+        
+        prioridades = Counter()
+        for role in member.roles:
+            prioridade = self.resolvedor.prioridade(role.id)
+            if prioridade:
+                prioridades[prioridade] += 1
+        
+        self.prioridades_membro[member.id] = prioridades
+        return self._reposicionar(member.id)
+    
+    def remover_membro(self, member_id):
+        """Remove um membro do índice (retorna True se ele estava na hierarquia)"""
+        self.prioridades_membro.pop(member_id, None)
+        return self._reposicionar(member_id)
+    
+    def atualizar_cargos(self, before, after):
+        """Aplica a diferença de cargos de um on_member_update (retorna True se o cargo mais alto mudou)"""
+        if after.bot:
+            return False
+        if after.id not in self.prioridades_membro:
+            return self.adicionar_membro(after)
+        
+        prioridades = self.prioridades_membro[after.id]
+        cargos_antes = set(before.roles)
+        cargos_depois = set(after.roles)
+        
+        for role in cargos_depois - cargos_antes:
+            prioridade = self.resolvedor.prioridade(role.id)
+            if prioridade:
+                prioridades[prioridade] += 1
+        
+        for role in cargos_antes - cargos_depois:
+            prioridade = self.resolvedor.prioridade(role.id)
+            if prioridade:
+                prioridades[prioridade] -= 1
+                if prioridades[prioridade] <= 0:
+                    del prioridades[prioridade]
+        
+        return self._reposicionar(after.id)
+    
+    def _reposicionar(self, member_id):
+        """Move o membro para o conjunto do seu cargo mais alto (retorna True se mudou)"""
+        prioridades = self.prioridades_membro.get(member_id)
+        novo = CARGOS_POR_PRIORIDADE[min(prioridades)]["display"] if prioridades else None
+        antigo = self.cargo_membro.get(member_id)
+        if novo == antigo:
+            return False
+        
+        if antigo:
+            self.membros_por_cargo[antigo].discard(member_id)
+        if novo:
+            self.membros_por_cargo[novo].add(member_id)
+            self.cargo_membro[member_id] = novo
+        else:
+            self.cargo_membro.pop(member_id, None)
+        return True
+
+def hash_mensagem(embeds):
+    """Hash de uma mensagem do painel (o rodapé só tem o horário da atualização)"""
+    return hash_embeds(embeds, ignorar=("footer", "timestamp"))
+
 class PainelHierarquiaView(ui.View):
     def __init__(self):
         super().__init__(timeout=None)
@@ -108,203 +246,197 @@ class PainelHierarquiaView(ui.View):
         
         await interaction.response.defer()
         
-        async for msg in interaction.channel.history(limit=50):
-            if msg.author == interaction.client.user and msg.embeds:
-                for embed in msg.embeds:
-                    if embed.title and any(t in embed.title for t in ["LIDERANÇA", "GERÊNCIA", "SUPERVISÃO", "ELITES", "MEMBROS", "TOTAL"]):
-                        await msg.delete()
-                        break
-        
-        embeds = cog.criar_embeds_hierarquia(interaction.guild)
-        mensagens = await cog.enviar_multiplas_mensagens(interaction.channel, embeds, view=self)
+        dados = cog.paineis_ativos.get(str(interaction.guild.id))
+        if dados and dados["canal_id"] == interaction.channel.id:
+            await cog._atualizar_painel_guild(interaction.guild, forcar=True)
+            return
         
-        if mensagens:
-            cog.paineis_ativos[str(interaction.guild.id)] = {
-                "canal_id": interaction.channel.id,
-                "mensagem_id": mensagens[0].id
-            }
-            cog.salvar_paineis()
+        # Painel de outro canal (ou não registrado): passa a ser este
+        cog.paineis_ativos[str(interaction.guild.id)] = {"canal_id": interaction.channel.id}
+        await cog.recriar_painel(interaction.guild, interaction.channel)
 
 class PainelHierarquia(commands.Cog, name="PainelHierarquia"):
     def __init__(self, bot):
         self.bot = bot
-        self.paineis_ativos = {}
+        self.resolvedores = {}  # {guild_id: ResolvedorCargos}
+        self.indices = {}  # {guild_id: IndiceHierarquia}
+        self.hashes_mensagens = {}  # {guild_id: [hash de cada mensagem do painel]} do último envio
+        self.estatisticas_api = nova_estatistica_api()
+        self.agendador = AgendadorAtualizacao(SILENCIO_ATUALIZACAO, LATENCIA_MAXIMA_ATUALIZACAO)
         print("✅ Módulo PainelHierarquia carregado!")
     
+    def cog_unload(self):
+        self.agendador.cancelar_todos()
+    
+    @property
+    def paineis_ativos(self):
+        """{guild_id: {"canal_id", "mensagens_ids", "mensagem_id"}} (configuração das guilds)"""
+        return config.secao("painel_hierarquia")
+    
+    def get_resolvedor(self, guild):
+        """Resolvedor de cargos da guild (montado no primeiro acesso)"""
+        resolvedor = self.resolvedores.get(guild.id)
+        if resolvedor is None:
+            resolvedor = ResolvedorCargos()
+            resolvedor.construir(guild)
+            self.resolvedores[guild.id] = resolvedor
+        return resolvedor
+    
+    def get_indice(self, guild):
+        """Índice de hierarquia da guild (montado no primeiro acesso)"""
+        indice = self.indices.get(guild.id)
+        if indice is None:
+            indice = IndiceHierarquia(self.get_resolvedor(guild))
+            indice.construir(guild)
+            self.indices[guild.id] = indice
+        return indice
+    
+    def reconstruir_resolvedor(self, guild):
+        """Remonta o mapa de cargos após criar/editar/apagar um cargo"""
+        if self.get_resolvedor(guild).construir(guild):
+            # Algum cargo entrou, saiu ou mudou de patamar: os membros precisam ser reclassificados
+            self.get_indice(guild).construir(guild)
+            self.agendar_atualizacao(guild)
+    
     async def enviar_multiplas_mensagens(self, channel, embeds, view=None):
         mensagens = []
-        embeds_atual = []
-        
-        for embed in embeds:
-            if len(embeds_atual) >= 10:
-                msg = await channel.send(embeds=embeds_atual)
-                mensagens.append(msg)
-                embeds_atual = []
-            embeds_atual.append(embed)
+        grupos = agrupar_em_mensagens(embeds)
         
-        if embeds_atual:
-            if view:
-                msg = await channel.send(embeds=embeds_atual, view=view)
+        for i, grupo in enumerate(grupos):
+            if view and i == len(grupos) - 1:
+                msg = await channel.send(embeds=grupo, view=view)
             else:
-                msg = await channel.send(embeds=embeds_atual)
+                msg = await channel.send(embeds=grupo)
             mensagens.append(msg)
         
         return mensagens
     
+    def registrar_mensagens(self, guild_id, mensagens, grupos):
+        """Guarda os IDs e o conteúdo das mensagens do painel da guild"""
+        ids = [msg.id for msg in mensagens]
+        self.paineis_ativos[guild_id]["mensagens_ids"] = ids
+        self.paineis_ativos[guild_id]["mensagem_id"] = ids[0]
+        self.hashes_mensagens[guild_id] = [hash_mensagem(grupo) for grupo in grupos]
+        self.estatisticas_api["enviadas"] += len(mensagens)
+        self.salvar_paineis()
+    
     def criar_embeds_hierarquia(self, guild):
-        membros_por_cargo = {cargo["display"]: [] for cargo in CARGOS_REAIS}
-        
-        for member in guild.members:
-            if member.bot:
-                continue
-            
-            cargo_mais_alto = encontrar_cargo_mais_alto(member, CARGOS_REAIS)
-            if cargo_mais_alto:
-                membros_por_cargo[cargo_mais_alto["display"]].append(member)
-        
-        todos_embeds = []
-        
-        # LIDERANÇA
-        embed1 = discord.Embed(title="👑 **LIDERANÇA**", color=discord.Color.gold())
-        for idx in [0, 1, 2, 3]:
-            cargo = CARGOS_REAIS[idx]
-            membros = membros_por_cargo[cargo["display"]]
-            valor = " ".join([m.mention for m in membros]) if membros else "`Lugar Disponível`"
-            embed1.add_field(name=f"{cargo['emoji']} **{cargo['display']}** ─ `{len(membros)}`", value=valor, inline=False)
-        todos_embeds.append(embed1)
-        
-        # GERÊNCIA
-        embed2 = discord.Embed(title="📊 **GERÊNCIA**", color=discord.Color.blue())
-        for idx in [4, 5, 6, 7]:
-            cargo = CARGOS_REAIS[idx]
-            membros = membros_por_cargo[cargo["display"]]
-            valor = " ".join([m.mention for m in membros]) if membros else "`Lugar Disponível`"
-            embed2.add_field(name=f"{cargo['emoji']} **{cargo['display']}** ─ `{len(membros)}`", value=valor, inline=False)
-        todos_embeds.append(embed2)
-        
-        # SUPERVISÃO
-        embed3 = discord.Embed(title="🔍 **SUPERVISÃO**", color=discord.Color.green())
-        for idx in [8, 9]:
-            cargo = CARGOS_REAIS[idx]
-            membros = membros_por_cargo[cargo["display"]]
-            valor = " ".join([m.mention for m in membros]) if membros else "`Lugar Disponível`"
-            embed3.add_field(name=f"{cargo['emoji']} **{cargo['display']}** ─ `{len(membros)}`", value=valor, inline=False)
-        todos_embeds.append(embed3)
-        
-        # ELITES
-        embed4 = discord.Embed(title="👑 **ELITES**", color=discord.Color.purple())
-        for idx in [10, 11, 12]:
-            cargo = CARGOS_REAIS[idx]
-            membros = membros_por_cargo[cargo["display"]]
-            print(f"  {cargo['display']}: {len(membros)} membros")
-            valor = " ".join([m.mention for m in membros]) if membros else "`Lugar Disponível`"
-            embed4.add_field(name=f"{cargo['emoji']} **{cargo['display']}** ─ `{len(membros)}`", value=valor, inline=False)
-        todos_embeds.append(embed4)
-        
-        # MEMBROS
-        cargo_membro = CARGOS_REAIS[13]
-        membros_membro = membros_por_cargo[cargo_membro["display"]]
+        indice = self.get_indice(guild)
+        membros_por_cargo = {}
+        for display, ids in indice.membros_por_cargo.items():
+            membros = (guild.get_member(member_id) for member_id in sorted(ids))
+            membros_por_cargo[display] = [m for m in membros if m]
+        membros_por_cargo[CARGOS_REAIS[13]["display"]].sort(key=lambda m: m.name.lower())
         
-        if membros_membro:
-            membros_membro.sort(key=lambda m: m.name.lower())
-            texto_atual = ""
-            numero_mensagem = 1
-            
-            for i, membro in enumerate(membros_membro, 1):
-                mencao = f"{membro.mention} "
-                
-                if len(texto_atual + mencao) > 900:
-                    titulo = "**MEMBROS:**" if numero_mensagem == 1 else f"**MEMBROS {numero_mensagem}:**"
-                    embed = discord.Embed(title=titulo, description=texto_atual, color=discord.Color.light_grey())
-                    todos_embeds.append(embed)
-                    
-                    numero_mensagem += 1
-                    texto_atual = mencao
-                else:
-                    texto_atual += mencao
-                
-                if i % 5 == 0:
-                    texto_atual += "\n"
-            
-            if texto_atual:
-                titulo = "**MEMBROS:**" if numero_mensagem == 1 else f"**MEMBROS {numero_mensagem}:**"
-                embed = discord.Embed(title=titulo, description=texto_atual, color=discord.Color.light_grey())
-                todos_embeds.append(embed)
-        else:
-            embed = discord.Embed(title="**MEMBROS:**", description="`Lugar Disponível`", color=discord.Color.light_grey())
-            todos_embeds.append(embed)
+        # Cargos com muitos membros continuam em mais campos/embeds sem passar dos limites do Discord
+        layout = LayoutEmbeds()
+        for titulo, cor, indices_cargos in SECOES_HIERARQUIA:
+            layout.secao(titulo, cor)
+            for idx in indices_cargos:
+                cargo = CARGOS_REAIS[idx]
+                membros = membros_por_cargo[cargo["display"]]
+                layout.campo(
+                    f"{cargo['emoji']} **{cargo['display']}** ─ `{len(membros)}`",
+                    [m.mention for m in membros],
+                    "`Lugar Disponível`"
+                )
         
         # TOTAL
         total_membros = sum(len(membros) for membros in membros_por_cargo.values())
-        embed_total = discord.Embed(title="📊 **TOTAL**", description=f"**{total_membros}** membros no servidor", color=discord.Color.blue())
-        embed_total.set_footer(text=f"Última atualização: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        todos_embeds.append(embed_total)
+        layout.secao(
+            "📊 **TOTAL**", discord.Color.blue(),
+            descricao=f"**{total_membros}** membros no servidor",
+            rodape=f"Última atualização: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
+        )
         
-        return todos_embeds
+        return layout.montar()
     
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
         if before.roles != after.roles:
-            await self.atualizar_todos_paineis(after.guild)
+            if after.guild.id not in self.indices:
+                # Índice montado agora a partir do cache, que já tem os cargos de `after`:
+                # aplicar a diferença de novo contaria os cargos em dobro
+                self.get_indice(after.guild)
+                self.agendar_atualizacao(after.guild)
+                return
+            if self.indices[after.guild.id].atualizar_cargos(before, after):
+                self.agendar_atualizacao(after.guild)
     
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        await self.atualizar_todos_paineis(member.guild)
+        if self.get_indice(member.guild).adicionar_membro(member):
+            self.agendar_atualizacao(member.guild)
     
     @commands.Cog.listener()
     async def on_member_remove(self, member):
-        await self.atualizar_todos_paineis(member.guild)
+        if self.get_indice(member.guild).remover_membro(member.id):
+            self.agendar_atualizacao(member.guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.get_indice(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.indices.pop(guild.id, None)
+        self.resolvedores.pop(guild.id, None)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.reconstruir_resolvedor(role.guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if before.name != after.name:
+            self.reconstruir_resolvedor(after.guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.reconstruir_resolvedor(role.guild)
     
     @commands.Cog.listener()
     async def on_ready(self):
         print("✅ PainelHierarquia cog pronto!")
+        # (Re)monta os índices: depois de uma reconexão o cache de membros pode ter mudado
+        self.resolvedores = {}
+        self.indices = {}
+        for guild in self.bot.guilds:
+            self.get_indice(guild)
         await self.carregar_paineis()
     
     async def carregar_paineis(self):
-        try:
-            if os.path.exists(ARQUIVO_PAINEIS):
-                with open(ARQUIVO_PAINEIS, 'r', encoding='utf-8') as f:
-                    self.paineis_ativos = json.load(f)
-                
-                for guild_id, dados in list(self.paineis_ativos.items()):
-                    try:
-                        guild = self.bot.get_guild(int(guild_id))
-                        if not guild:
-                            continue
-                        
-                        canal = guild.get_channel(dados["canal_id"])
-                        if not canal:
-                            continue
-                        
-                        try:
-                            mensagem = await canal.fetch_message(dados["mensagem_id"])
-                            self.bot.add_view(PainelHierarquiaView(), message_id=mensagem.id)
-                            print(f"  ✅ Painel recuperado em #{canal.name}")
-                        except:
-                            del self.paineis_ativos[guild_id]
-                    except:
-                        continue
-                
-                self.salvar_paineis()
-        except:
-            self.paineis_ativos = {}
+        await restaurar_paineis(
+            self.bot, "PainelHierarquia", self.paineis_ativos,
+            self.registrar_painel_restaurado, self.salvar_paineis
+        )
+    
+    def registrar_painel_restaurado(self, guild_id, dados):
+        # O botão fica na última mensagem do painel
+        ultima_id = (dados.get("mensagens_ids") or [dados.get("mensagem_id")])[-1]
+        if ultima_id:
+            self.bot.add_view(PainelHierarquiaView(), message_id=ultima_id)
     
     def salvar_paineis(self):
-        try:
-            with open(ARQUIVO_PAINEIS, 'w', encoding='utf-8') as f:
-                json.dump(self.paineis_ativos, f, indent=4)
-        except:
-            pass
+        """Agenda a gravação da configuração (não bloqueia o event loop)"""
+        config.salvar()
     
-    async def atualizar_todos_paineis(self, guild=None):
+    def agendar_atualizacao(self, guild):
+        """Agenda a atualização do painel da guild (eventos em rajada viram uma edição)"""
+        guild_id = str(guild.id)
+        if guild_id in self.paineis_ativos:
+            self.agendador.agendar(guild_id, lambda: self._atualizar_painel_agendado(guild.id))
+    
+    async def _atualizar_painel_agendado(self, guild_id):
+        guild = self.bot.get_guild(guild_id)
         if guild:
-            guild_id = str(guild.id)
-            if guild_id in self.paineis_ativos:
-                await self._atualizar_painel_guild(guild)
+            await self._atualizar_painel_guild(guild)
     
-    async def _atualizar_painel_guild(self, guild):
+    async def _atualizar_painel_guild(self, guild, forcar=False):
+        """Edita só as mensagens do painel cujo conteúdo mudou"""
+        guild_id = str(guild.id)
         try:
-            dados = self.paineis_ativos.get(str(guild.id))
+            dados = self.paineis_ativos.get(guild_id)
             if not dados:
                 return
             
@@ -312,25 +444,80 @@ class PainelHierarquia(commands.Cog, name="PainelHierarquia"):
             if not canal:
                 return
             
+            ids = dados.get("mensagens_ids")
+            if not ids:
+                # Painel salvo no formato antigo (só a primeira mensagem): recria uma vez
+                await self.recriar_painel(guild, canal)
+                return
+            
+            grupos = agrupar_em_mensagens(self.criar_embeds_hierarquia(guild))
+            anteriores = self.hashes_mensagens.get(guild_id, [])
+            hashes = [hash_mensagem(grupo) for grupo in grupos]
+            novos_ids = []
+            
             try:
-                async for msg in canal.history(limit=50):
-                    if msg.author == self.bot.user and msg.embeds:
-                        for embed in msg.embeds:
-                            if embed.title and any(t in embed.title for t in ["LIDERANÇA", "GERÊNCIA", "SUPERVISÃO", "ELITES", "MEMBROS", "TOTAL"]):
-                                await msg.delete()
-                                break
-                
-                embeds = self.criar_embeds_hierarquia(guild)
-                mensagens = await self.enviar_multiplas_mensagens(canal, embeds, view=PainelHierarquiaView())
+                for i, grupo in enumerate(grupos):
+                    ultimo = i == len(grupos) - 1
+                    view = PainelHierarquiaView() if ultimo else None
+                    
+                    if i >= len(ids):
+                        # Mais páginas que antes (a antiga última já perdeu o botão na edição acima)
+                        msg = await canal.send(embeds=grupo, view=view)
+                        self.estatisticas_api["enviadas"] += 1
+                        novos_ids.append(msg.id)
+                        continue
+                    
+                    era_ultimo = i == len(ids) - 1
+                    if forcar or ultimo != era_ultimo or i >= len(anteriores) or anteriores[i] != hashes[i]:
+                        await canal.get_partial_message(ids[i]).edit(embeds=grupo, view=view)
+                        self.estatisticas_api["enviadas"] += 1
+                    else:
+                        self.estatisticas_api["ignoradas"] += 1
+                    novos_ids.append(ids[i])
                 
-                if mensagens:
-                    self.paineis_ativos[str(guild.id)]["mensagem_id"] = mensagens[0].id
-                    self.salvar_paineis()
-            except:
-                del self.paineis_ativos[str(guild.id)]
+                # Menos páginas que antes: apaga as que sobraram
+                for mensagem_id in ids[len(grupos):]:
+                    try:
+                        await canal.get_partial_message(mensagem_id).delete()
+                    except discord.NotFound:
+                        pass
+            except discord.NotFound:
+                # Alguma mensagem do painel foi apagada manualmente: recria o painel inteiro
+                await self.recriar_painel(guild, canal)
+                return
+            
+            self.hashes_mensagens[guild_id] = hashes
+            if novos_ids != ids:
+                dados["mensagens_ids"] = novos_ids
+                dados["mensagem_id"] = novos_ids[0]
                 self.salvar_paineis()
-        except:
-            pass
+        except Exception as e:
+            print(f"❌ Erro ao atualizar painel de hierarquia em {guild.name}: {e}")
+    
+    async def recriar_painel(self, guild, canal):
+        """Apaga as mensagens antigas do painel e envia tudo de novo"""
+        guild_id = str(guild.id)
+        dados = self.paineis_ativos[guild_id]
+        
+        ids = dados.get("mensagens_ids")
+        if ids:
+            for mensagem_id in ids:
+                try:
+                    await canal.get_partial_message(mensagem_id).delete()
+                except discord.HTTPException:
+                    pass
+        else:
+            # Formato antigo: sem a lista de IDs, procura as mensagens do painel no histórico
+            async for msg in canal.history(limit=50):
+                if msg.author == self.bot.user and msg.embeds:
+                    for embed in msg.embeds:
+                        if embed.title and any(t in embed.title for t in TITULOS_PAINEL):
+                            await msg.delete()
+                            break
+        
+        embeds = self.criar_embeds_hierarquia(guild)
+        mensagens = await self.enviar_multiplas_mensagens(canal, embeds, view=PainelHierarquiaView())
+        self.registrar_mensagens(guild_id, mensagens, agrupar_em_mensagens(embeds))
     
     @commands.command(name="setup_hierarquia", aliases=["hierarquia"])
     @commands.has_permissions(administrator=True)
@@ -353,11 +540,8 @@ class PainelHierarquia(commands.Cog, name="PainelHierarquia"):
             mensagens = await self.enviar_multiplas_mensagens(ctx.channel, embeds, view=PainelHierarquiaView())
             
             if mensagens:
-                self.paineis_ativos[str(ctx.guild.id)] = {
-                    "canal_id": ctx.channel.id,
-                    "mensagem_id": mensagens[0].id
-                }
-                self.salvar_paineis()
+                self.paineis_ativos[str(ctx.guild.id)] = {"canal_id": ctx.channel.id}
+                self.registrar_mensagens(str(ctx.guild.id), mensagens, agrupar_em_mensagens(embeds))
                 
                 for msg in mensagens:
                     self.bot.add_view(PainelHierarquiaView(), message_id=msg.id)
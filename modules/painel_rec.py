@@ -1,18 +1,57 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import ui, ButtonStyle
 import asyncio
-from datetime import datetime
-import json
+import atexit
+import bisect
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import time
 import os
 import re
 from dateutil.relativedelta import relativedelta
+from typing import Optional
+from modules.armazenamento_rec import criar_armazenamento, gravar_json_atomico
+from modules.agendador import AgendadorAtualizacao
+from modules.config_guild import config
+from modules.embeds import hash_embeds, nova_estatistica_api
+from modules.restauracao import restaurar_paineis
 
 # ========== CONFIGURAÇÃO ==========
 ARQUIVO_RECRUTADORES = "recrutadores.json"
 ARQUIVO_RECRUTAS = "recrutas.json"
 ARQUIVO_HISTORICO = "historico_recrutadores.json"
 ARQUIVO_RECORDES = "recordes.json"
+ARQUIVO_BANCO = "recrutamento.db"
+ARQUIVO_JOURNAL = "recrutamento_journal.jsonl"
+ARQUIVO_SNAPSHOT = "recrutamento_snapshot.json"
+
+ARQUIVOS_RECRUTAMENTO = {
+    "recrutadores": ARQUIVO_RECRUTADORES,
+    "recrutas": ARQUIVO_RECRUTAS,
+    "historico_mensal": ARQUIVO_HISTORICO,
+    "recordes": ARQUIVO_RECORDES,
+}
+
+# Cada guild tem seus dados em DIRETORIO_DADOS/<guild_id>/ (os arquivos acima na raiz são o formato antigo, global)
+DIRETORIO_DADOS = "dados_recrutamento"
+ARQUIVO_MIGRACAO = os.path.join(DIRETORIO_DADOS, "migracao_guilds.json")  # marca a separação por guild como feita
+
+# Motor de armazenamento: "json" (arquivos), "sqlite" (banco WAL) ou "journal" (eventos JSONL + snapshot).
+# Os motores sqlite e journal importam os arquivos JSON na primeira execução.
+MOTOR_ARMAZENAMENTO = os.getenv("REC_ARMAZENAMENTO", "json").lower()
+
+# Segundos para agrupar gravações (write-behind); 0 grava a cada alteração
+INTERVALO_GRAVACAO = float(os.getenv("REC_INTERVALO_GRAVACAO", "0"))
+
+# Janela (segundos) em que recrutamentos seguidos viram uma única edição do painel
+JANELA_ATUALIZACAO_PAINEL = 5.0
+
+# Quantos colocados ficam pré-calculados por mês arquivado / nos recordes
+TOP_AGREGADOS = 10
+
+# Máximo de páginas renderizadas mantidas em cache
+MAX_CACHE_PAGINAS = 256
 
 # Cargos de staff (mesmos do sistema de cargos)
 STAFF_ROLES = [
@@ -53,39 +92,156 @@ def usuario_pode_usar_painel(member: discord.Member) -> bool:
     
     return False
 
-class GerenciadorRecrutadores:
-    """Gerencia os dados de recrutadores e recrutas"""
+def converter_data(data: str) -> float:
+    """Converte a data "dd/mm/YYYY HH:MM" dos recrutas em timestamp"""
+    try:
+        return datetime.strptime(data, '%d/%m/%Y %H:%M').timestamp()
+    except (ValueError, TypeError):
+        return 0.0
+
+def data_comando(texto):
+    """Data "dd/mm/aaaa" de um argumento de comando (ValueError se não for uma data)"""
+    return datetime.strptime(texto, '%d/%m/%Y')
+
+def caminhos_recrutamento(guild_id=None):
+    """Caminhos dos arquivos de uma guild (ou dos arquivos globais antigos se guild_id=None)"""
+    diretorio = "" if guild_id is None else os.path.join(DIRETORIO_DADOS, str(guild_id))
+    return {
+        "diretorio": diretorio,
+        "arquivos": {colecao: os.path.join(diretorio, nome) for colecao, nome in ARQUIVOS_RECRUTAMENTO.items()},
+        "banco": os.path.join(diretorio, ARQUIVO_BANCO),
+        "journal": os.path.join(diretorio, ARQUIVO_JOURNAL),
+        "snapshot": os.path.join(diretorio, ARQUIVO_SNAPSHOT),
+    }
+
+def existe_dados_legados():
+    """Indica se há dados globais (de antes da separação por guild) na raiz ainda não migrados"""
+    if os.path.exists(ARQUIVO_MIGRACAO):
+        return False
+    caminhos = caminhos_recrutamento()
+    arquivos = list(caminhos["arquivos"].values()) + [caminhos["banco"], caminhos["journal"], caminhos["snapshot"]]
+    return any(os.path.exists(arquivo) for arquivo in arquivos)
+
+class RankingRecrutadores:
+    """Ranking do mês mantido incrementalmente (só quem tem total > 0, maior primeiro)
+    
+    Os totais só sobem de 1 em 1, então basta trocar o recrutador com o primeiro
+    do seu bloco de empate: cada incremento custa O(1) e a lista nunca é reordenada.
+    """
     
     def __init__(self):
+        self.ordem = []  # ids do maior para o menor total
+        self.posicao = {}  # {recrutador_id: índice em self.ordem}
+        self.totais = {}  # {recrutador_id: total}
+        self.inicio_bloco = {}  # {total: primeiro índice com esse total}
+        self.soma = 0
+    
+    def __len__(self):
+        return len(self.ordem)
+    
+    def limpar(self):
+        """Zera o ranking de uma vez (virada de mês / reset)"""
+        self.ordem = []
+        self.posicao = {}
+        self.totais = {}
+        self.inicio_bloco = {}
+        self.soma = 0
+    
+    def reconstruir(self, recrutadores):
+        """Monta o ranking a partir dos totais salvos"""
+        ativos = [(rid, dados["total"]) for rid, dados in recrutadores.items() if dados["total"] > 0]
+        ativos.sort(key=lambda x: x[1], reverse=True)
+        
+        self.limpar()
+        for i, (rid, total) in enumerate(ativos):
+            self.ordem.append(rid)
+            self.posicao[rid] = i
+            self.totais[rid] = total
+            self.inicio_bloco.setdefault(total, i)
+            self.soma += total
+    
+    def incrementar(self, rid):
+        """Soma 1 ao total do recrutador mantendo a ordem"""
+        total = self.totais.get(rid, 0)
+        self.soma += 1
+        
+        if total == 0:
+            # Total 1 é sempre o último bloco: entra no fim da lista
+            self.posicao[rid] = len(self.ordem)
+            self.ordem.append(rid)
+            self.totais[rid] = 1
+            self.inicio_bloco.setdefault(1, self.posicao[rid])
+            return
+        
+        # Troca com o primeiro do bloco de empate e sai desse bloco
+        i = self.posicao[rid]
+        j = self.inicio_bloco[total]
+        if i != j:
+            outro = self.ordem[j]
+            self.ordem[i], self.ordem[j] = outro, rid
+            self.posicao[outro] = i
+            self.posicao[rid] = j
+        
+        if j + 1 < len(self.ordem) and self.totais[self.ordem[j + 1]] == total:
+            self.inicio_bloco[total] = j + 1
+        else:
+            del self.inicio_bloco[total]
+        
+        self.totais[rid] = total + 1
+        self.inicio_bloco.setdefault(total + 1, j)
+    
+    def fatia(self, inicio=0, fim=None):
+        """Retorna [(recrutador_id, total)] das posições pedidas"""
+        return [(rid, self.totais[rid]) for rid in self.ordem[inicio:fim]]
+
+class GerenciadorRecrutadores:
+    """Gerencia os dados de recrutadores e recrutas de uma guild"""
+    
+    def __init__(self, guild_id=None, motor=None, intervalo_gravacao=None, somente_leitura=False):
+        self.guild_id = guild_id
+        self.somente_leitura = somente_leitura  # dados globais antigos: sem gravação nem virada de mês
         self.recrutadores = {}  # {recrutador_id: {"nome": nome, "total": 0}}
         self.recrutas = {}  # {recruta_id: {"nome": nome, "recrutador_id": id, "pago": false, "data": ""}}
         self.historico_mensal = {}  # {mes_ano: {recrutador_id: total}}
         self.recordes = {}  # {recrutador_id: {"maior_mes": total, "mes": mes/ano, "nome": nome}}
+        self.recrutas_por_recrutador = {}  # {recrutador_id: [(timestamp, recruta_id), ...]} em ordem cronológica
+        self.linha_do_tempo = []  # [(timestamp, recruta_id), ...] de toda a guild, em ordem cronológica
+        self.nao_pagos = []  # [(timestamp, recruta_id), ...] dos recrutas ainda não pagos, em ordem cronológica
+        self.ranking = RankingRecrutadores()
+        self.mes_contadores = self.get_mes_atual_key()  # mês ao qual os totais atuais pertencem
+        self.agregados_mensais = {}  # {mes_ano: {"top": [(recrutador_id, total)], "total": n, "ativos": n}}
+        self.top_recordes = []  # recrutador_ids dos maiores recordes (maior primeiro)
+        self.alteracoes = {}  # {colecao: set(chaves)} pendentes de gravação
+        self.intervalo_gravacao = INTERVALO_GRAVACAO if intervalo_gravacao is None else intervalo_gravacao
+        self.gravacao_agendada = None
+        self.reproduzindo = False  # True enquanto eventos do journal são reaplicados
+        self.versao = 0  # sobe a cada alteração (invalida páginas renderizadas)
+        caminhos = caminhos_recrutamento(guild_id)
+        if caminhos["diretorio"]:
+            os.makedirs(caminhos["diretorio"], exist_ok=True)
+        self.armazenamento = criar_armazenamento(
+            motor or MOTOR_ARMAZENAMENTO, caminhos["arquivos"], caminhos["banco"],
+            caminhos["journal"], caminhos["snapshot"]
+        )
+        if somente_leitura:
+            self.intervalo_gravacao = 0
+            self.carregar_dados()
+            return
+        
+        atexit.register(self.descarregar)
         self.carregar_dados()
         self.verificar_novo_mes()
     
     def carregar_dados(self):
-        """Carrega dados do arquivo JSON"""
+        """Carrega dados do armazenamento configurado"""
+        eventos = []
         try:
-            if os.path.exists(ARQUIVO_RECRUTADORES):
-                with open(ARQUIVO_RECRUTADORES, 'r', encoding='utf-8') as f:
-                    self.recrutadores = json.load(f)
-                print(f"✅ Dados de recrutadores carregados: {len(self.recrutadores)} recrutadores")
-            
-            if os.path.exists(ARQUIVO_RECRUTAS):
-                with open(ARQUIVO_RECRUTAS, 'r', encoding='utf-8') as f:
-                    self.recrutas = json.load(f)
-                print(f"✅ Dados de recrutas carregados: {len(self.recrutas)} recrutas")
-            
-            if os.path.exists(ARQUIVO_HISTORICO):
-                with open(ARQUIVO_HISTORICO, 'r', encoding='utf-8') as f:
-                    self.historico_mensal = json.load(f)
-                print(f"✅ Histórico mensal carregado: {len(self.historico_mensal)} meses")
-            
-            if os.path.exists(ARQUIVO_RECORDES):
-                with open(ARQUIVO_RECORDES, 'r', encoding='utf-8') as f:
-                    self.recordes = json.load(f)
-                print(f"✅ Recordes carregados: {len(self.recordes)} recordes")
+            dados = self.armazenamento.carregar()
+            self.recrutadores = dados["recrutadores"]
+            self.recrutas = dados["recrutas"]
+            self.historico_mensal = dados["historico_mensal"]
+            self.recordes = dados["recordes"]
+            eventos = dados.get("eventos", [])
                 
         except Exception as e:
             print(f"❌ Erro ao carregar dados: {e}")
@@ -93,26 +249,162 @@ class GerenciadorRecrutadores:
             self.recrutas = {}
             self.historico_mensal = {}
             self.recordes = {}
+        
+        preenchidos = self.preencher_timestamps()
+        self.reconstruir_indices()
+        
+        # Motor journal: reaplica os eventos posteriores ao último snapshot
+        if eventos:
+            self.reproduzindo = True
+            try:
+                for evento in eventos:
+                    self.aplicar_evento(evento)
+            finally:
+                self.reproduzindo = False
+                self.alteracoes = {}
+            print(f"✅ {len(eventos)} eventos reaplicados do journal")
+        
+        if preenchidos and not self.somente_leitura:
+            self.salvar_dados()
+            print(f"✅ Timestamp preenchido em {preenchidos} recrutas antigos")
+        
+        origem = f"guild {self.guild_id}" if self.guild_id else "global"
+        print(f"✅ Dados de recrutamento carregados ({origem}): {len(self.recrutadores)} recrutadores, "
+              f"{len(self.recrutas)} recrutas, {len(self.historico_mensal)} meses, {len(self.recordes)} recordes")
+    
+    def preencher_timestamps(self):
+        """Calcula o "ts" dos recrutas gravados antes de existir o campo (retorna quantos)"""
+        preenchidos = 0
+        for dados in self.recrutas.values():
+            if not dados.get("ts"):
+                dados["ts"] = converter_data(dados["data"])
+                preenchidos += 1
+        return preenchidos
+    
+    def reconstruir_indices(self):
+        """Monta o ranking e os índices cronológicos a partir dos dados"""
+        self.ranking.reconstruir(self.recrutadores)
+        
+        self.recrutas_por_recrutador = {}
+        self.linha_do_tempo = []
+        self.nao_pagos = []
+        for r_id, dados in self.recrutas.items():
+            chave = (dados["ts"], r_id)
+            self.recrutas_por_recrutador.setdefault(dados["recrutador_id"], []).append(chave)
+            self.linha_do_tempo.append(chave)
+            if not dados["pago"]:
+                self.nao_pagos.append(chave)
+        
+        for lista in self.recrutas_por_recrutador.values():
+            lista.sort()
+        self.linha_do_tempo.sort()
+        self.nao_pagos.sort()
+        
+        # Os totais atuais pertencem ao mês do recruta mais recente
+        ultimo = max((lista[-1][0] for lista in self.recrutas_por_recrutador.values()), default=0)
+        if ultimo and len(self.ranking):
+            self.mes_contadores = datetime.fromtimestamp(ultimo).strftime('%m/%Y')
+        else:
+            self.mes_contadores = self.get_mes_atual_key()
+        
+        self.agregados_mensais = {mes: self.calcular_agregado(dados) for mes, dados in self.historico_mensal.items()}
+        self.top_recordes = sorted(self.recordes, key=lambda rid: self.recordes[rid]["maior_mes"], reverse=True)[:TOP_AGREGADOS]
+    
+    def calcular_agregado(self, dados_mes):
+        """Pré-calcula top, total e ativos de um mês arquivado"""
+        top = sorted(dados_mes.items(), key=lambda x: x[1], reverse=True)[:TOP_AGREGADOS]
+        return {"top": top, "total": sum(dados_mes.values()), "ativos": len(dados_mes)}
+    
+    def atualizar_top_recordes(self, recrutador_id):
+        """Reposiciona um recorde que acabou de subir no top pré-calculado"""
+        valor = self.recordes[recrutador_id]["maior_mes"]
+        if recrutador_id not in self.top_recordes:
+            if len(self.top_recordes) >= TOP_AGREGADOS and valor <= self.recordes[self.top_recordes[-1]]["maior_mes"]:
+                return
+            self.top_recordes.append(recrutador_id)
+        
+        self.top_recordes.sort(key=lambda rid: self.recordes[rid]["maior_mes"], reverse=True)
+        del self.top_recordes[TOP_AGREGADOS:]
+    
+    def importar(self, dados):
+        """Substitui todos os dados (usado na separação dos dados globais por guild)"""
+        self.recrutadores = dados["recrutadores"]
+        self.recrutas = dados["recrutas"]
+        self.historico_mensal = dados["historico_mensal"]
+        self.recordes = dados["recordes"]
+        self.versao += 1
+        self.preencher_timestamps()
+        self.reconstruir_indices()
+        self.salvar_dados()
+    
+    def get_dados(self):
+        """Retorna as coleções no formato esperado pelo armazenamento"""
+        return {
+            "recrutadores": self.recrutadores,
+            "recrutas": self.recrutas,
+            "historico_mensal": self.historico_mensal,
+            "recordes": self.recordes,
+        }
     
     def salvar_dados(self):
-        """Salva dados no arquivo JSON"""
+        """Salva todas as coleções"""
+        self.cancelar_gravacao_agendada()
         try:
-            with open(ARQUIVO_RECRUTADORES, 'w', encoding='utf-8') as f:
-                json.dump(self.recrutadores, f, indent=4, ensure_ascii=False)
-            
-            with open(ARQUIVO_RECRUTAS, 'w', encoding='utf-8') as f:
-                json.dump(self.recrutas, f, indent=4, ensure_ascii=False)
-            
-            with open(ARQUIVO_HISTORICO, 'w', encoding='utf-8') as f:
-                json.dump(self.historico_mensal, f, indent=4, ensure_ascii=False)
-            
-            with open(ARQUIVO_RECORDES, 'w', encoding='utf-8') as f:
-                json.dump(self.recordes, f, indent=4, ensure_ascii=False)
-                
+            self.armazenamento.salvar(self.get_dados())
+            self.alteracoes = {}
             print("✅ Dados salvos com sucesso!")
         except Exception as e:
             print(f"❌ Erro ao salvar dados: {e}")
     
+    def marcar_alteracao(self, colecao, chave):
+        """Registra uma chave alterada para a próxima gravação"""
+        self.alteracoes.setdefault(colecao, set()).add(chave)
+    
+    def salvar_alteracoes(self):
+        """Grava o que foi alterado, agora ou no próximo ciclo do write-behind"""
+        if not self.alteracoes:
+            return
+        
+        if self.intervalo_gravacao > 0:
+            self.agendar_gravacao()
+        else:
+            self.descarregar()
+    
+    def agendar_gravacao(self):
+        """Agenda uma única gravação para o fim do intervalo (rajadas viram uma escrita)"""
+        if self.gravacao_agendada:
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Fora do event loop não há como adiar
+            self.descarregar()
+            return
+        
+        self.gravacao_agendada = loop.call_later(self.intervalo_gravacao, self.descarregar)
+    
+    def cancelar_gravacao_agendada(self):
+        if self.gravacao_agendada:
+            self.gravacao_agendada.cancel()
+            self.gravacao_agendada = None
+    
+    def descarregar(self):
+        """Grava imediatamente as alterações pendentes"""
+        self.cancelar_gravacao_agendada()
+        if not self.alteracoes:
+            return
+        
+        alteracoes = self.alteracoes
+        self.alteracoes = {}
+        try:
+            self.armazenamento.salvar(self.get_dados(), alteracoes)
+        except Exception as e:
+            print(f"❌ Erro ao salvar dados: {e}")
+            # Mantém as alterações para a próxima tentativa
+            for colecao, chaves in alteracoes.items():
+                self.alteracoes.setdefault(colecao, set()).update(chaves)
+    
     def get_mes_atual_key(self):
         """Retorna a chave do mês atual (MM/YYYY)"""
         return datetime.now().strftime('%m/%Y')
@@ -122,42 +414,37 @@ class GerenciadorRecrutadores:
         mes_passado = datetime.now() - relativedelta(months=1)
         return mes_passado.strftime('%m/%Y')
     
-    def verificar_novo_mes(self):
-        """Verifica se entrou em um novo mês e arquiva os dados"""
-        mes_atual = self.get_mes_atual_key()
+    # ========== EVENTOS ==========
+    def executar_evento(self, evento):
+        """Registra o evento no armazenamento, aplica em memória e persiste"""
+        evento["em"] = datetime.now().isoformat()
+        try:
+            self.armazenamento.registrar_evento(evento)
+        except Exception as e:
+            print(f"❌ Erro ao registrar evento {evento['tipo']}: {e}")
         
-        # Se não temos histórico do mês atual, significa que é um novo mês
-        if mes_atual not in self.historico_mensal:
-            print(f"📅 Novo mês detectado: {mes_atual}")
-            
-            # Arquiva o mês passado se existir
-            mes_passado = self.get_mes_passado_key()
-            if mes_passado not in self.historico_mensal and self.recrutadores:
-                # Salva o snapshot do mês passado
-                snapshot = {}
-                for rid, dados in self.recrutadores.items():
-                    if dados["total"] > 0:
-                        snapshot[rid] = dados["total"]
-                
-                if snapshot:
-                    self.historico_mensal[mes_passado] = snapshot
-                    print(f"✅ Mês {mes_passado} arquivado com {len(snapshot)} recrutadores ativos")
-            
-            # Reseta os contadores do mês atual
-            for rid in self.recrutadores:
-                self.recrutadores[rid]["total"] = 0
-            
-            self.salvar_dados()
+        self.aplicar_evento(evento)
+        self.salvar_alteracoes()
     
-    def adicionar_recrutamento(self, recrutador_id, recrutador_nome, recruta_id, recruta_nome):
-        """Adiciona um novo recruta e atualiza o contador do recrutador"""
-        recrutador_id = str(recrutador_id)
-        recruta_id = str(recruta_id)
-        
-        # Verificar se recruta já existe
-        if recruta_id in self.recrutas:
-            print(f"⚠️ Recruta {recruta_nome} já existe!")
-            return False
+    def aplicar_evento(self, evento):
+        """Aplica um evento ao estado em memória (também usado ao reaplicar o journal)"""
+        self.versao += 1
+        tipo = evento["tipo"]
+        if tipo == "recruta_adicionado":
+            self._aplicar_recruta_adicionado(evento)
+        elif tipo == "recruta_pago":
+            self._aplicar_recruta_pago(evento)
+        elif tipo == "mes_virado":
+            self._aplicar_mes_virado(evento)
+        elif tipo == "reset":
+            self.recrutadores = {}
+            self.recrutas = {}
+            self.reconstruir_indices()
+    
+    def _aplicar_recruta_adicionado(self, evento):
+        recrutador_id = evento["recrutador_id"]
+        recrutador_nome = evento["recrutador_nome"]
+        recruta_id = evento["recruta_id"]
         
         # Adicionar/atualizar recrutador
         if recrutador_id not in self.recrutadores:
@@ -168,14 +455,20 @@ class GerenciadorRecrutadores:
         
         # Adicionar recruta
         self.recrutas[recruta_id] = {
-            "nome": recruta_nome,
+            "nome": evento["recruta_nome"],
             "recrutador_id": recrutador_id,
             "pago": False,
-            "data": datetime.now().strftime('%d/%m/%Y %H:%M')
+            "data": evento["data"],
+            "ts": evento["ts"]
         }
+        chave = (evento["ts"], recruta_id)
+        bisect.insort(self.recrutas_por_recrutador.setdefault(recrutador_id, []), chave)
+        bisect.insort(self.linha_do_tempo, chave)
+        bisect.insort(self.nao_pagos, chave)
         
         # Incrementar total do recrutador
         self.recrutadores[recrutador_id]["total"] += 1
+        self.ranking.incrementar(recrutador_id)
         novo_total = self.recrutadores[recrutador_id]["total"]
         self.recrutadores[recrutador_id]["nome"] = recrutador_nome  # Atualiza nome
         
@@ -184,58 +477,122 @@ class GerenciadorRecrutadores:
             if novo_total > self.recordes[recrutador_id]["maior_mes"]:
                 self.recordes[recrutador_id] = {
                     "maior_mes": novo_total,
-                    "mes": self.get_mes_atual_key(),
+                    "mes": evento["mes"],
                     "nome": recrutador_nome
                 }
-                print(f"🏆 NOVO RECORDE para {recrutador_nome}: {novo_total} recrutas!")
+                self.atualizar_top_recordes(recrutador_id)
+                if not self.reproduzindo:
+                    print(f"🏆 NOVO RECORDE para {recrutador_nome}: {novo_total} recrutas!")
         else:
             self.recordes[recrutador_id] = {
                 "maior_mes": novo_total,
-                "mes": self.get_mes_atual_key(),
+                "mes": evento["mes"],
                 "nome": recrutador_nome
             }
+            self.atualizar_top_recordes(recrutador_id)
         
-        self.salvar_dados()
+        self.marcar_alteracao("recrutadores", recrutador_id)
+        self.marcar_alteracao("recrutas", recruta_id)
+        self.marcar_alteracao("recordes", recrutador_id)
+    
+    def _aplicar_recruta_pago(self, evento):
+        recruta = self.recrutas[evento["recruta_id"]]
+        if not recruta["pago"]:
+            chave = (recruta["ts"], evento["recruta_id"])
+            i = bisect.bisect_left(self.nao_pagos, chave)
+            if i < len(self.nao_pagos) and self.nao_pagos[i] == chave:
+                del self.nao_pagos[i]
+        recruta["pago"] = True
+        self.marcar_alteracao("recrutas", evento["recruta_id"])
+    
+    def _aplicar_mes_virado(self, evento):
+        mes_arquivado = evento["mes_arquivado"]
+        self.mes_contadores = evento["mes_atual"]
+        
+        # Salva o snapshot do mês que terminou (o ranking só contém quem tem total > 0)
+        snapshot = dict(self.ranking.fatia())
+        if snapshot and mes_arquivado not in self.historico_mensal:
+            self.historico_mensal[mes_arquivado] = snapshot
+            self.agregados_mensais[mes_arquivado] = self.calcular_agregado(snapshot)
+            self.marcar_alteracao("historico_mensal", mes_arquivado)
+            if not self.reproduzindo:
+                print(f"✅ Mês {mes_arquivado} arquivado com {len(snapshot)} recrutadores ativos")
+        
+        # Reseta os contadores do mês atual
+        for rid in self.ranking.ordem:
+            self.recrutadores[rid]["total"] = 0
+            self.marcar_alteracao("recrutadores", rid)
+        self.ranking.limpar()
+    
+    # ========== OPERAÇÕES ==========
+    def verificar_novo_mes(self):
+        """Verifica se entrou em um novo mês e arquiva os dados (retorna True se virou)"""
+        mes_atual = self.get_mes_atual_key()
+        if self.mes_contadores == mes_atual:
+            return False
+        
+        print(f"📅 Novo mês detectado: {mes_atual}")
+        self.executar_evento({
+            "tipo": "mes_virado",
+            "mes_arquivado": self.mes_contadores,
+            "mes_atual": mes_atual
+        })
+        return True
+    
+    def adicionar_recrutamento(self, recrutador_id, recrutador_nome, recruta_id, recruta_nome):
+        """Adiciona um novo recruta e atualiza o contador do recrutador"""
+        recrutador_id = str(recrutador_id)
+        recruta_id = str(recruta_id)
+        
+        # Verificar se recruta já existe
+        if recruta_id in self.recrutas:
+            print(f"⚠️ Recruta {recruta_nome} já existe!")
+            return False
+        
+        # Garante que o primeiro recruta do mês não caia nos totais do mês anterior
+        self.verificar_novo_mes()
+        
+        agora = datetime.now()
+        self.executar_evento({
+            "tipo": "recruta_adicionado",
+            "recrutador_id": recrutador_id,
+            "recrutador_nome": recrutador_nome,
+            "recruta_id": recruta_id,
+            "recruta_nome": recruta_nome,
+            "data": agora.strftime('%d/%m/%Y %H:%M'),
+            "ts": agora.timestamp(),
+            "mes": self.get_mes_atual_key()
+        })
         print(f"✅ Recruta {recruta_nome} adicionado a {recrutador_nome}")
         return True
     
     def get_top_mes_passado(self, limite=3):
         """Retorna os top recrutadores do mês passado"""
-        mes_passado = self.get_mes_passado_key()
+        agregado = self.agregados_mensais.get(self.get_mes_passado_key())
         
-        if mes_passado not in self.historico_mensal:
+        if not agregado:
             return []
         
-        dados_mes = self.historico_mensal[mes_passado]
-        lista = []
-        
-        for rid, total in dados_mes.items():
-            nome = self.recrutadores.get(rid, {}).get("nome", "Desconhecido")
-            lista.append({
+        return [
+            {
                 "id": rid,
-                "nome": nome,
+                "nome": self.recrutadores.get(rid, {}).get("nome", "Desconhecido"),
                 "total": total
-            })
-        
-        # Ordenar por total (maior primeiro)
-        lista.sort(key=lambda x: x["total"], reverse=True)
-        return lista[:limite]
+            }
+            for rid, total in agregado["top"][:limite]
+        ]
     
     def get_recordes_gerais(self, limite=3):
         """Retorna os maiores recordes de todos os tempos"""
-        lista = []
-        
-        for rid, dados in self.recordes.items():
-            lista.append({
+        return [
+            {
                 "id": rid,
-                "nome": dados["nome"],
-                "total": dados["maior_mes"],
-                "mes": dados["mes"]
-            })
-        
-        # Ordenar por total (maior primeiro)
-        lista.sort(key=lambda x: x["total"], reverse=True)
-        return lista[:limite]
+                "nome": self.recordes[rid]["nome"],
+                "total": self.recordes[rid]["maior_mes"],
+                "mes": self.recordes[rid]["mes"]
+            }
+            for rid in self.top_recordes[:limite]
+        ]
     
     def get_recordista_geral(self):
         """Retorna o recordista geral (maior número em um único mês)"""
@@ -246,8 +603,7 @@ class GerenciadorRecrutadores:
         """Marca um recruta como pago"""
         recruta_id = str(recruta_id)
         if recruta_id in self.recrutas:
-            self.recrutas[recruta_id]["pago"] = True
-            self.salvar_dados()
+            self.executar_evento({"tipo": "recruta_pago", "recruta_id": recruta_id})
             return True
         return False
     
@@ -256,33 +612,105 @@ class GerenciadorRecrutadores:
         recrutador_id = str(recrutador_id)
         recrutas_lista = []
         
-        for r_id, dados in self.recrutas.items():
-            if dados["recrutador_id"] == recrutador_id:
-                recrutas_lista.append({
-                    "id": r_id,
-                    "nome": dados["nome"],
-                    "pago": dados["pago"],
-                    "data": dados["data"]
-                })
+        # Índice já está em ordem cronológica: percorre do mais recente para o mais antigo
+        for _, r_id in reversed(self.recrutas_por_recrutador.get(recrutador_id, [])):
+            recrutas_lista.append(self.formatar_recruta(r_id))
         
-        # Ordenar por data (mais recente primeiro)
-        recrutas_lista.sort(key=lambda x: x["data"], reverse=True)
         return recrutas_lista
     
-    def get_top_recrutadores(self, limite=10):
-        """Retorna os top recrutadores do mês atual"""
-        lista = []
-        for rid, dados in self.recrutadores.items():
-            if dados["total"] > 0:  # Só mostra quem tem recrutas
-                lista.append({
+    def formatar_recruta(self, recruta_id):
+        """Monta o dicionário de um recruta no formato usado pelas views"""
+        dados = self.recrutas[recruta_id]
+        return {
+            "id": recruta_id,
+            "nome": dados["nome"],
+            "recrutador_id": dados["recrutador_id"],
+            "pago": dados["pago"],
+            "data": dados["data"],
+            "ts": dados["ts"]
+        }
+    
+    # ========== CONSULTAS POR PERÍODO ==========
+    def _fatia_periodo(self, lista, inicio, fim):
+        """Trecho de um índice cronológico com inicio <= ts < fim (busca binária)"""
+        i = bisect.bisect_left(lista, (inicio,)) if inicio is not None else 0
+        j = bisect.bisect_left(lista, (fim,)) if fim is not None else len(lista)
+        return lista[i:j]
+    
+    def _indice(self, recrutador_id=None):
+        if recrutador_id is None:
+            return self.linha_do_tempo
+        return self.recrutas_por_recrutador.get(str(recrutador_id), [])
+    
+    def contar_periodo(self, inicio, fim, recrutador_id=None):
+        """Conta recrutas com inicio <= ts < fim (da guild ou de um recrutador)"""
+        lista = self._indice(recrutador_id)
+        return bisect.bisect_left(lista, (fim,)) - bisect.bisect_left(lista, (inicio,))
+    
+    def get_recrutas_periodo(self, inicio, fim, recrutador_id=None):
+        """Recrutas com inicio <= ts < fim, do mais antigo para o mais recente"""
+        return [self.formatar_recruta(r_id) for _, r_id in self._fatia_periodo(self._indice(recrutador_id), inicio, fim)]
+    
+    def get_recrutas_semana(self, referencia=None, recrutador_id=None):
+        """Recrutas da semana (segunda a domingo) que contém a data de referência"""
+        referencia = referencia or datetime.now()
+        segunda = datetime(referencia.year, referencia.month, referencia.day) - timedelta(days=referencia.weekday())
+        return self.get_recrutas_periodo(segunda.timestamp(), (segunda + timedelta(days=7)).timestamp(), recrutador_id)
+    
+    def get_contagem_diaria(self, recrutador_id, inicio, fim):
+        """Lista [(dd/mm/YYYY, total)] com a contagem de cada dia entre inicio e fim"""
+        lista = self._indice(recrutador_id)
+        dia = datetime.fromtimestamp(inicio).replace(hour=0, minute=0, second=0, microsecond=0)
+        contagem = []
+        while dia.timestamp() < fim:
+            proximo = dia + timedelta(days=1)
+            total = bisect.bisect_left(lista, (proximo.timestamp(),)) - bisect.bisect_left(lista, (dia.timestamp(),))
+            contagem.append((dia.strftime('%d/%m/%Y'), total))
+            dia = proximo
+        return contagem
+    
+    def get_ranking_periodo(self, inicio, fim, limite=None):
+        """Recrutadores ordenados pelo número de recrutas no período"""
+        ranking = []
+        for rid, lista in self.recrutas_por_recrutador.items():
+            total = bisect.bisect_left(lista, (fim,)) - bisect.bisect_left(lista, (inicio,))
+            if total:
+                ranking.append({
                     "id": rid,
-                    "nome": dados["nome"],
-                    "total": dados["total"]
+                    "nome": self.recrutadores.get(rid, {}).get("nome", "Desconhecido"),
+                    "total": total
                 })
-        
-        # Ordenar por total (maior primeiro)
-        lista.sort(key=lambda x: x["total"], reverse=True)
-        return lista
+        ranking.sort(key=lambda rec: rec["total"], reverse=True)
+        return ranking[:limite]
+    
+    def get_nao_pagos_antigos(self, dias):
+        """Recrutas ainda não pagos há mais de N dias, do mais antigo para o mais recente"""
+        limite = time.time() - dias * 86400
+        return [self.formatar_recruta(r_id) for _, r_id in self._fatia_periodo(self.nao_pagos, None, limite)]
+    
+    def contar_nao_pagos_antigos(self, dias):
+        """Quantidade de recrutas não pagos há mais de N dias"""
+        return bisect.bisect_left(self.nao_pagos, (time.time() - dias * 86400,))
+    
+    def get_top_recrutadores(self, limite=None):
+        """Retorna os top recrutadores do mês atual (todos se limite=None)"""
+        return self.get_pagina_ranking(0, limite)
+    
+    def get_pagina_ranking(self, inicio, fim):
+        """Retorna os recrutadores entre as posições inicio e fim do ranking"""
+        return [
+            {
+                "id": rid,
+                "nome": self.recrutadores[rid]["nome"],
+                "total": total
+            }
+            for rid, total in self.ranking.fatia(inicio, fim)
+        ]
+    
+    def resetar(self):
+        """Apaga recrutadores e recrutas (contadores e lista de pagamentos)"""
+        self.executar_evento({"tipo": "reset"})
+        self.salvar_dados()
     
     def get_total_geral(self):
         """Retorna total de recrutamentos de todos os tempos"""
@@ -290,11 +718,50 @@ class GerenciadorRecrutadores:
     
     def get_total_recrutadores(self):
         """Retorna número de recrutadores ativos no mês atual"""
-        return len([r for r in self.recrutadores.values() if r["total"] > 0])
+        return len(self.ranking)
     
     def get_total_geral_mes(self):
         """Retorna total de recrutamentos do mês atual"""
-        return sum(r["total"] for r in self.recrutadores.values())
+        return self.ranking.soma
+
+# ========== CACHE DE PÁGINAS RENDERIZADAS ==========
+class CacheEmbeds:
+    """LRU de embeds já renderizados, chaveado por (guild_id, versao, pagina)"""
+    
+    def __init__(self, maximo=MAX_CACHE_PAGINAS):
+        self.maximo = maximo
+        self.embeds = OrderedDict()
+        self.versoes = {}  # {guild_id: versão dos embeds guardados}
+    
+    def obter(self, guild_id, versao, pagina):
+        chave = (guild_id, versao, pagina)
+        embed = self.embeds.get(chave)
+        if embed is not None:
+            self.embeds.move_to_end(chave)
+        return embed
+    
+    def guardar(self, guild_id, versao, pagina, embed):
+        # Dados mudaram: descarta as páginas da versão anterior desta guild
+        if self.versoes.get(guild_id) != versao:
+            self.invalidar(guild_id)
+            self.versoes[guild_id] = versao
+        
+        self.embeds[(guild_id, versao, pagina)] = embed
+        if len(self.embeds) > self.maximo:
+            self.embeds.popitem(last=False)
+    
+    def invalidar(self, guild_id):
+        for chave in [c for c in self.embeds if c[0] == guild_id]:
+            del self.embeds[chave]
+        self.versoes.pop(guild_id, None)
+
+cache_paginas = CacheEmbeds()
+
+def esquecer_hash_painel(interaction):
+    """A mensagem do painel mudou de página: a próxima atualização não pode ser ignorada"""
+    cog = interaction.client.get_cog("PainelRec")
+    if cog:
+        cog.hashes_painel.pop(str(interaction.guild.id), None)
 
 # ========== VIEW DO PAINEL PRINCIPAL COM PAGINAÇÃO ==========
 class PainelRecView(ui.View):
@@ -307,13 +774,20 @@ class PainelRecView(ui.View):
         self.recrutadores_por_pagina = 5
     
     def criar_embed_pagina(self, guild, pagina):
+        """Retorna o embed de uma página (do cache se os dados não mudaram)"""
+        embed = cache_paginas.obter(guild.id, self.gerenciador.versao, pagina)
+        if embed is None:
+            embed = self.renderizar_pagina(guild, pagina)
+            cache_paginas.guardar(guild.id, self.gerenciador.versao, pagina, embed)
+        return embed
+    
+    def renderizar_pagina(self, guild, pagina):
         """Cria o embed para uma página específica"""
-        todos_recrutadores = self.gerenciador.get_top_recrutadores()
-        total_paginas = (len(todos_recrutadores) + self.recrutadores_por_pagina - 1) // self.recrutadores_por_pagina
+        total_paginas = (self.gerenciador.get_total_recrutadores() + self.recrutadores_por_pagina - 1) // self.recrutadores_por_pagina
         
         inicio = pagina * self.recrutadores_por_pagina
         fim = inicio + self.recrutadores_por_pagina
-        recrutadores_pagina = todos_recrutadores[inicio:fim]
+        recrutadores_pagina = self.gerenciador.get_pagina_ranking(inicio, fim)
         
         total_geral = self.gerenciador.get_total_geral_mes()
         
@@ -380,13 +854,13 @@ class PainelRecView(ui.View):
             await interaction.response.send_message("❌ Você não tem permissão!", ephemeral=True)
             return
         
-        todos_recrutadores = self.gerenciador.get_top_recrutadores()
-        total_paginas = (len(todos_recrutadores) + self.recrutadores_por_pagina - 1) // self.recrutadores_por_pagina
+        total_paginas = (self.gerenciador.get_total_recrutadores() + self.recrutadores_por_pagina - 1) // self.recrutadores_por_pagina
         
         if self.pagina > 0:
             self.pagina -= 1
             embed = self.criar_embed_pagina(interaction.guild, self.pagina)
             await interaction.response.edit_message(embed=embed, view=self)
+            esquecer_hash_painel(interaction)
         else:
             await interaction.response.send_message("❌ Você já está na primeira página!", ephemeral=True)
     
@@ -400,14 +874,14 @@ class PainelRecView(ui.View):
             return
         
         # Criar select com todos os recrutadores
-        todos_recrutadores = self.gerenciador.get_top_recrutadores()
+        todos_recrutadores = self.gerenciador.get_top_recrutadores(25)
         
         if not todos_recrutadores:
             await interaction.response.send_message("❌ Nenhum recrutador encontrado!", ephemeral=True)
             return
         
         options = []
-        for rec in todos_recrutadores[:25]:  # Limitar a 25 opções
+        for rec in todos_recrutadores:  # Já limitado a 25 opções
             label = f"{rec['nome']} - {rec['total']} recrutas"
             membro = interaction.guild.get_member(int(rec['id']))
             if membro:
@@ -438,13 +912,13 @@ class PainelRecView(ui.View):
             await interaction.response.send_message("❌ Você não tem permissão!", ephemeral=True)
             return
         
-        todos_recrutadores = self.gerenciador.get_top_recrutadores()
-        total_paginas = (len(todos_recrutadores) + self.recrutadores_por_pagina - 1) // self.recrutadores_por_pagina
+        total_paginas = (self.gerenciador.get_total_recrutadores() + self.recrutadores_por_pagina - 1) // self.recrutadores_por_pagina
         
         if self.pagina < total_paginas - 1:
             self.pagina += 1
             embed = self.criar_embed_pagina(interaction.guild, self.pagina)
             await interaction.response.edit_message(embed=embed, view=self)
+            esquecer_hash_painel(interaction)
         else:
             await interaction.response.send_message("❌ Você já está na última página!", ephemeral=True)
     
@@ -684,10 +1158,10 @@ class RecrutasPagosView(ui.View):
     @ui.button(label="🔙 Voltar", style=ButtonStyle.gray, custom_id="recrutas_voltar")
     async def voltar(self, interaction: discord.Interaction, button: ui.Button):
         """Volta para a seleção de recrutadores"""
-        todos_recrutadores = self.gerenciador.get_top_recrutadores()
+        todos_recrutadores = self.gerenciador.get_top_recrutadores(25)
         
         options = []
-        for rec in todos_recrutadores[:25]:
+        for rec in todos_recrutadores:
             label = f"{rec['nome']} - {rec['total']} recrutas"
             membro = interaction.guild.get_member(int(rec['id']))
             if membro:
@@ -773,90 +1247,236 @@ class PainelRecCog(commands.Cog, name="PainelRec"):
     
     def __init__(self, bot):
         self.bot = bot
-        self.gerenciador = GerenciadorRecrutadores()
-        self.paineis_ativos = {}  # {guild_id: {"canal_id": canal_id, "mensagem_id": mensagem_id}}
+        self.gerenciadores = {}  # {guild_id: GerenciadorRecrutadores} carregados sob demanda
+        self.mensagens_painel = {}  # {guild_id: discord.PartialMessage} (evita fetch_message)
+        self.hashes_painel = {}  # {guild_id: hash do último embed enviado}
+        self.estatisticas_api = nova_estatistica_api()
+        self.agendador = AgendadorAtualizacao(JANELA_ATUALIZACAO_PAINEL)
         print("✅ Módulo PainelRec carregado!")
     
+    async def cog_load(self):
+        self.virada_mes.start()
+    
+    @property
+    def paineis_ativos(self):
+        """{guild_id: {"canal_id": canal_id, "mensagem_id": mensagem_id}} (configuração das guilds)"""
+        return config.secao("painel_rec")
+    
+    def cog_unload(self):
+        """Grava dados pendentes do write-behind antes de descarregar"""
+        self.virada_mes.cancel()
+        self.agendador.cancelar_todos()
+        for gerenciador in self.gerenciadores.values():
+            gerenciador.descarregar()
+    
+    def get_gerenciador(self, guild_id):
+        """Retorna os dados de recrutamento da guild, carregando do disco no primeiro acesso"""
+        guild_id = str(guild_id)
+        gerenciador = self.gerenciadores.get(guild_id)
+        if gerenciador is None:
+            gerenciador = GerenciadorRecrutadores(guild_id)
+            self.gerenciadores[guild_id] = gerenciador
+        return gerenciador
+    
+    def migrar_dados_legados(self):
+        """Separa os dados globais antigos por guild (uma única vez)
+        
+        Cada recruta vai para a guild da qual é membro (ou, se saiu, para a
+        guild do recrutador; sem nenhuma das duas, para a guild do painel
+        antigo ou a primeira guild). O total atual de cada recrutador é
+        recontado com os recrutas que foram para cada guild. Histórico e
+        recorde ficam só na guild com mais recrutas do recrutador, para que
+        nada seja contado duas vezes. Os arquivos originais são renomeados
+        para *.legado e um marcador impede nova migração.
+        """
+        if not existe_dados_legados() or not self.bot.guilds:
+            return
+        
+        print("📦 Separando dados de recrutamento globais por guild...")
+        legado = GerenciadorRecrutadores(somente_leitura=True)
+        legado.armazenamento.fechar()
+        
+        principal = next((g for g in self.bot.guilds if str(g.id) in self.paineis_ativos), self.bot.guilds[0])
+        
+        def guild_do_membro(user_id):
+            return next((g for g in self.bot.guilds if g.get_member(int(user_id))), None)
+        
+        # Cada recruta em uma única guild
+        recrutas_por_guild = {guild.id: {} for guild in self.bot.guilds}
+        por_recrutador = {}  # {recrutador_id: {guild_id: quantidade}}
+        for r_id, dados in legado.recrutas.items():
+            guild = guild_do_membro(r_id) or guild_do_membro(dados["recrutador_id"]) or principal
+            recrutas_por_guild[guild.id][r_id] = dict(dados)
+            contagem = por_recrutador.setdefault(dados["recrutador_id"], {})
+            contagem[guild.id] = contagem.get(guild.id, 0) + 1
+        
+        # Guild principal de cada recrutador: onde ficou a maioria dos seus recrutas
+        ordem = {guild.id: i for i, guild in enumerate(self.bot.guilds)}
+        guild_principal = {}
+        for rid in legado.recrutadores:
+            contagem = por_recrutador.get(rid)
+            if contagem:
+                guild_principal[rid] = max(contagem, key=lambda g_id: (contagem[g_id], -ordem[g_id]))
+            else:
+                guild_principal[rid] = (guild_do_membro(rid) or principal).id
+        
+        destinos = {}
+        for guild in self.bot.guilds:
+            recrutas = recrutas_por_guild[guild.id]
+            ids = {rid for rid, g_id in guild_principal.items() if g_id == guild.id}
+            ids |= {dados["recrutador_id"] for dados in recrutas.values() if dados["recrutador_id"] in legado.recrutadores}
+            if not ids:
+                continue
+            destinos[guild.id] = ids
+            
+            # Total atual = recrutas desta guild no mês dos contadores antigos
+            recrutadores = {rid: dict(legado.recrutadores[rid], total=0) for rid in ids}
+            for dados in recrutas.values():
+                rid = dados["recrutador_id"]
+                if rid in recrutadores and datetime.fromtimestamp(dados["ts"]).strftime('%m/%Y') == legado.mes_contadores:
+                    recrutadores[rid]["total"] += 1
+            
+            principais = {rid for rid in ids if guild_principal[rid] == guild.id}
+            historico = {}
+            for mes, dados_mes in legado.historico_mensal.items():
+                dados_guild = {rid: total for rid, total in dados_mes.items() if rid in principais}
+                if dados_guild:
+                    historico[mes] = dados_guild
+            
+            gerenciador = self.get_gerenciador(guild.id)
+            gerenciador.importar({
+                "recrutadores": recrutadores,
+                "recrutas": recrutas,
+                "historico_mensal": historico,
+                "recordes": {rid: dict(dados) for rid, dados in legado.recordes.items() if rid in principais},
+            })
+            # Os totais recontados são do mês dos contadores antigos; se esse mês já
+            # passou, eles são arquivados na cópia da guild
+            gerenciador.mes_contadores = legado.mes_contadores
+            gerenciador.verificar_novo_mes()
+            gerenciador.descarregar()
+            print(f"  ✅ {len(recrutas)} recrutas e {len(ids)} recrutadores migrados para {guild.name}")
+        
+        os.makedirs(DIRETORIO_DADOS, exist_ok=True)
+        gravar_json_atomico(ARQUIVO_MIGRACAO, {
+            "data": datetime.now().isoformat(),
+            "guilds": {str(guild_id): sorted(ids) for guild_id, ids in destinos.items() if ids},
+        })
+        
+        caminhos = caminhos_recrutamento()
+        for arquivo in list(caminhos["arquivos"].values()) + [caminhos["banco"], caminhos["journal"], caminhos["snapshot"]]:
+            if os.path.exists(arquivo):
+                destino = f"{arquivo}.legado"
+                if os.path.exists(destino):
+                    # Nunca sobrescreve um backup anterior
+                    destino = f"{arquivo}.{datetime.now().strftime('%Y%m%d%H%M%S')}.legado"
+                os.replace(arquivo, destino)
+    
+    @tasks.loop()
+    async def virada_mes(self):
+        """Dorme até a virada do mês e arquiva os contadores (sem depender de reinício)"""
+        inicio_mes = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        await discord.utils.sleep_until(inicio_mes + relativedelta(months=1, seconds=5))
+        
+        for guild_id, gerenciador in list(self.gerenciadores.items()):
+            if gerenciador.verificar_novo_mes():
+                self.agendar_atualizacao_painel(guild_id)
+    
     @commands.Cog.listener()
     async def on_ready(self):
         """Quando o bot inicia, recarrega painéis existentes"""
         print("✅ PainelRec cog pronto!")
         await self.carregar_paineis()
+        
+        try:
+            self.migrar_dados_legados()
+        except Exception as e:
+            print(f"❌ Erro ao separar dados de recrutamento por guild: {e}")
     
     async def carregar_paineis(self):
         """Tenta carregar painéis salvos anteriormente"""
-        try:
-            if os.path.exists("paineis_rec.json"):
-                with open("paineis_rec.json", 'r', encoding='utf-8') as f:
-                    self.paineis_ativos = json.load(f)
-                
-                print(f"📋 Carregando {len(self.paineis_ativos)} painéis salvos...")
-                
-                for guild_id, dados in list(self.paineis_ativos.items()):
-                    try:
-                        guild = self.bot.get_guild(int(guild_id))
-                        if not guild:
-                            continue
-                        
-                        canal = guild.get_channel(dados["canal_id"])
-                        if not canal:
-                            continue
-                        
-                        try:
-                            mensagem = await canal.fetch_message(dados["mensagem_id"])
-                            self.bot.add_view(PainelRecView(self.gerenciador), message_id=mensagem.id)
-                            print(f"  ✅ Painel recuperado em #{canal.name} ({guild.name})")
-                        except:
-                            del self.paineis_ativos[guild_id]
-                    except:
-                        continue
-                
-                self.salvar_paineis()
-        except:
-            self.paineis_ativos = {}
+        await restaurar_paineis(
+            self.bot, "PainelRec", self.paineis_ativos,
+            self.registrar_painel_restaurado, self.salvar_paineis
+        )
+    
+    def registrar_painel_restaurado(self, guild_id, dados):
+        # A mensagem em si (PartialMessage) é obtida sob demanda em get_mensagem_painel
+        self.bot.add_view(PainelRecView(self.get_gerenciador(guild_id)), message_id=dados["mensagem_id"])
     
     def salvar_paineis(self):
-        """Salva os painéis ativos em arquivo"""
-        try:
-            with open("paineis_rec.json", 'w', encoding='utf-8') as f:
-                json.dump(self.paineis_ativos, f, indent=4)
-        except:
-            pass
+        """Agenda a gravação da configuração (não bloqueia o event loop)"""
+        config.salvar()
     
-    def adicionar_recrutamento(self, recrutador_id, recrutador_nome, recruta_id, recruta_nome):
+    def adicionar_recrutamento(self, guild_id, recrutador_id, recrutador_nome, recruta_id, recruta_nome):
         """Método público para outros módulos adicionarem recrutamentos"""
-        resultado = self.gerenciador.adicionar_recrutamento(recrutador_id, recrutador_nome, recruta_id, recruta_nome)
+        resultado = self.get_gerenciador(guild_id).adicionar_recrutamento(recrutador_id, recrutador_nome, recruta_id, recruta_nome)
         
         if resultado:
-            asyncio.create_task(self.atualizar_todos_paineis())
+            self.agendar_atualizacao_painel(guild_id)
         
         return resultado
     
+    def agendar_atualizacao_painel(self, guild_id):
+        """Agenda a atualização do painel da guild (rajadas de recrutamentos viram uma edição)"""
+        guild_id = str(guild_id)
+        if guild_id in self.paineis_ativos:
+            self.agendador.agendar(guild_id, lambda: self.atualizar_painel(guild_id))
+    
+    def get_mensagem_painel(self, guild_id):
+        """Retorna a mensagem do painel sem chamar a API (PartialMessage em cache)"""
+        mensagem = self.mensagens_painel.get(guild_id)
+        if mensagem:
+            return mensagem
+        
+        dados = self.paineis_ativos.get(guild_id)
+        guild = self.bot.get_guild(int(guild_id))
+        if not dados or not guild:
+            return None
+        
+        canal = guild.get_channel(dados["canal_id"])
+        if not canal:
+            return None
+        
+        mensagem = canal.get_partial_message(dados["mensagem_id"])
+        self.mensagens_painel[guild_id] = mensagem
+        return mensagem
+    
+    async def atualizar_painel(self, guild_id):
+        """Edita o painel de uma guild com o ranking atual"""
+        mensagem = self.get_mensagem_painel(guild_id)
+        if not mensagem:
+            return
+        
+        try:
+            # Criar nova view com página resetada
+            view = PainelRecView(self.get_gerenciador(guild_id))
+            embed = view.criar_embed_pagina(mensagem.guild, 0)
+            
+            # Mesmo conteúdo do último envio: não chama a API
+            hash_atual = hash_embeds([embed])
+            if self.hashes_painel.get(guild_id) == hash_atual:
+                self.estatisticas_api["ignoradas"] += 1
+                return
+            
+            await mensagem.edit(embed=embed, view=view)
+            self.hashes_painel[guild_id] = hash_atual
+            self.estatisticas_api["enviadas"] += 1
+            print(f"  ✅ Painel atualizado em #{mensagem.channel.name}")
+        except discord.NotFound:
+            # Mensagem apagada: o painel deixa de existir
+            self.mensagens_painel.pop(guild_id, None)
+            self.hashes_painel.pop(guild_id, None)
+            self.paineis_ativos.pop(guild_id, None)
+            self.salvar_paineis()
+        except discord.HTTPException as e:
+            print(f"⚠️ Falha ao atualizar painel ({guild_id}): {e}")
+    
     async def atualizar_todos_paineis(self):
         """Atualiza todos os painéis ativos"""
         print("🔄 Atualizando todos os painéis...")
-        for guild_id, dados in list(self.paineis_ativos.items()):
-            try:
-                guild = self.bot.get_guild(int(guild_id))
-                if not guild:
-                    continue
-                
-                canal = guild.get_channel(dados["canal_id"])
-                if not canal:
-                    continue
-                
-                try:
-                    mensagem = await canal.fetch_message(dados["mensagem_id"])
-                    # Criar nova view com página resetada
-                    view = PainelRecView(self.gerenciador)
-                    embed = view.criar_embed_pagina(guild, 0)
-                    await mensagem.edit(embed=embed, view=view)
-                    print(f"  ✅ Painel atualizado em #{canal.name}")
-                except:
-                    del self.paineis_ativos[guild_id]
-                    self.salvar_paineis()
-            except:
-                continue
+        for guild_id in list(self.paineis_ativos):
+            await self.atualizar_painel(guild_id)
     
     @commands.command(name="setup_painel", aliases=["painel"])
     @commands.has_permissions(administrator=True)
@@ -879,7 +1499,8 @@ class PainelRecCog(commands.Cog, name="PainelRec"):
     async def criar_novo_painel(self, ctx):
         """Cria um novo painel no canal"""
         
-        view = PainelRecView(self.gerenciador)
+        gerenciador = self.get_gerenciador(ctx.guild.id)
+        view = PainelRecView(gerenciador)
         embed = view.criar_embed_pagina(ctx.guild, 0)
         
         mensagem = await ctx.send(embed=embed, view=view)
@@ -888,9 +1509,12 @@ class PainelRecCog(commands.Cog, name="PainelRec"):
             "canal_id": ctx.channel.id,
             "mensagem_id": mensagem.id
         }
+        self.mensagens_painel[str(ctx.guild.id)] = mensagem
+        self.hashes_painel[str(ctx.guild.id)] = hash_embeds([embed])
+        self.estatisticas_api["enviadas"] += 1
         self.salvar_paineis()
         
-        self.bot.add_view(PainelRecView(self.gerenciador), message_id=mensagem.id)
+        self.bot.add_view(PainelRecView(gerenciador), message_id=mensagem.id)
         
         confirm = await ctx.send("✅ **Painel criado com sucesso!** O ranking será atualizado automaticamente.")
         await asyncio.sleep(3)
@@ -902,9 +1526,10 @@ class PainelRecCog(commands.Cog, name="PainelRec"):
     async def rec_stats(self, ctx):
         """📊 Mostra estatísticas detalhadas"""
         
-        total_geral = self.gerenciador.get_total_geral()
-        total_mes = self.gerenciador.get_total_geral_mes()
-        total_recrutadores = self.gerenciador.get_total_recrutadores()
+        gerenciador = self.get_gerenciador(ctx.guild.id)
+        total_geral = gerenciador.get_total_geral()
+        total_mes = gerenciador.get_total_geral_mes()
+        total_recrutadores = gerenciador.get_total_recrutadores()
         
         embed = discord.Embed(
             title="📊 Estatísticas de Recrutamento",
@@ -915,7 +1540,7 @@ class PainelRecCog(commands.Cog, name="PainelRec"):
         embed.add_field(name="Total no Mês", value=f"**{total_mes}**", inline=True)
         embed.add_field(name="Recrutadores Ativos", value=f"**{total_recrutadores}**", inline=True)
         
-        top = self.gerenciador.get_top_recrutadores()[:3]
+        top = gerenciador.get_top_recrutadores(3)
         if top:
             top_text = ""
             for i, rec in enumerate(top, 1):
@@ -930,6 +1555,71 @@ class PainelRecCog(commands.Cog, name="PainelRec"):
         await ctx.send(embed=embed)
         await ctx.message.delete()
     
+    @commands.command(name="rec_periodo")
+    @commands.has_permissions(administrator=True)
+    async def rec_periodo(self, ctx, inicio: str, fim: Optional[data_comando] = None, membro: Optional[discord.Member] = None):
+        """📅 Recrutamentos entre duas datas (dd/mm/aaaa), opcionalmente de um recrutador"""
+        
+        try:
+            data_inicio = data_comando(inicio)
+        except ValueError:
+            await ctx.send("❌ Use: `!rec_periodo dd/mm/aaaa [dd/mm/aaaa] [@recrutador]`", delete_after=10)
+            return
+        data_fim = fim or datetime.now()
+        
+        # A data final é inclusiva: vai até o fim do dia
+        ts_inicio = data_inicio.timestamp()
+        ts_fim = (data_fim.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)).timestamp()
+        if ts_fim <= ts_inicio:
+            await ctx.send("❌ A data final deve ser depois da inicial!", delete_after=10)
+            return
+        
+        gerenciador = self.get_gerenciador(ctx.guild.id)
+        recrutador_id = membro.id if membro else None
+        
+        inicio_consulta = time.perf_counter()
+        total = gerenciador.contar_periodo(ts_inicio, ts_fim, recrutador_id)
+        if membro:
+            diario = gerenciador.get_contagem_diaria(recrutador_id, ts_inicio, ts_fim)
+        else:
+            top = gerenciador.get_ranking_periodo(ts_inicio, ts_fim, 10)
+        antigos = gerenciador.contar_nao_pagos_antigos(7)
+        tempo_consulta = (time.perf_counter() - inicio_consulta) * 1000
+        
+        periodo = f"{data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}"
+        embed = discord.Embed(
+            title="📅 Recrutamentos no Período",
+            description=f"**{periodo}**" + (f"\nRecrutador: {membro.mention}" if membro else ""),
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Total no Período", value=f"**{total}**", inline=True)
+        embed.add_field(name="Não pagos há +7 dias", value=f"**{antigos}**", inline=True)
+        
+        if membro:
+            dias_com_recrutas = [(dia, n) for dia, n in diario if n]
+            if dias_com_recrutas:
+                texto = "\n".join(f"`{dia}` — `{n}` recruta(s)" for dia, n in dias_com_recrutas[-20:])
+                if len(dias_com_recrutas) > 20:
+                    texto = f"*... {len(dias_com_recrutas) - 20} dias anteriores*\n" + texto
+                embed.add_field(name="📆 Por Dia", value=texto, inline=False)
+        elif top:
+            top_text = ""
+            for i, rec in enumerate(top, 1):
+                membro_rec = ctx.guild.get_member(int(rec['id']))
+                display_nome = membro_rec.mention if membro_rec else rec['nome']
+                top_text += f"`{i}º` {display_nome} — `{rec['total']}` recruta(s)\n"
+            embed.add_field(name="🏆 Top 10 do Período", value=top_text, inline=False)
+        
+        embed.set_footer(text=f"⏱️ Consulta em {tempo_consulta:.3f} ms")
+        
+        await ctx.send(embed=embed)
+        await ctx.message.delete()
+    
+    @rec_periodo.error
+    async def rec_periodo_erro(self, ctx, error):
+        if isinstance(error, commands.BadArgument):
+            await ctx.send("❌ Use: `!rec_periodo dd/mm/aaaa [dd/mm/aaaa] [@recrutador]`", delete_after=10)
+    
     @commands.command(name="rec_reset")
     @commands.has_permissions(administrator=True)
     async def rec_reset(self, ctx):
@@ -963,6 +1653,7 @@ class ConfirmaSubstituirView(ui.View):
         
         if str(self.ctx.guild.id) in self.cog.paineis_ativos:
             del self.cog.paineis_ativos[str(self.ctx.guild.id)]
+            self.cog.mensagens_painel.pop(str(self.ctx.guild.id), None)
             self.cog.salvar_paineis()
         
         await self.cog.criar_novo_painel(self.ctx)
@@ -994,11 +1685,9 @@ class ConfirmaResetView(ui.View):
         
         await interaction.response.defer()
         
-        self.cog.gerenciador.recrutadores = {}
-        self.cog.gerenciador.recrutas = {}
-        self.cog.gerenciador.salvar_dados()
+        self.cog.get_gerenciador(self.ctx.guild.id).resetar()
         
-        await self.cog.atualizar_todos_paineis()
+        await self.cog.atualizar_painel(str(self.ctx.guild.id))
         
         await interaction.message.delete()
         await self.ctx.send("✅ **Todos os contadores foram resetados!**", delete_after=5)
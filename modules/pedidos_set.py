@@ -0,0 +1,209 @@
+import atexit
+import json
+import os
+import re
+import time
+from datetime import datetime
+from modules.armazenamento_rec import GravacaoAgrupada
+
+# ========== CONFIGURAÇÃO ==========
+ARQUIVO_PENDENTES = "sets_pendentes.json"
+TTL_RESERVA = 120  # segundos que um envio em andamento segura o ID do FiveM
+
+# ========== REGISTRO DE PEDIDOS PENDENTES ==========
+class RegistroPendentes:
+    """Pedidos de set aguardando aprovação, por guild
+
+    Indexados pela mensagem no canal de aprovação, pelo ID do FiveM e pelo
+    usuário, para que checagens de duplicidade e listagens não precisem ler
+    o histórico do canal.
+    
+    Enquanto um pedido está sendo enviado (entre a checagem e o registro) o
+    ID do FiveM fica reservado, com expiração, para que dois envios
+    simultâneos não passem com o mesmo ID.
+    """
+
+    def __init__(self, arquivo=ARQUIVO_PENDENTES):
+        self.arquivo = arquivo
+        self.pedidos = {}  # {guild_id: {message_id: pedido}}
+        self.por_fivem = {}  # {guild_id: {fivem_id: message_id}}
+        self.por_usuario = {}  # {guild_id: {user_id: message_id}}
+        self.reservas = {}  # {guild_id: {fivem_id: (user_id, expira_em)}} envios em andamento
+        self.reivindicados = set()  # {(guild_id, message_id)} pedidos já pegos para aprovar/recusar
+        self.gravacao = GravacaoAgrupada(arquivo, lambda: self.pedidos)
+        atexit.register(self.descarregar)
+
+    def carregar(self):
+        """Carrega os pedidos salvos e monta os índices"""
+        self.pedidos = {}
+        self.por_fivem = {}
+        self.por_usuario = {}
+        try:
+            if os.path.exists(self.arquivo):
+                with open(self.arquivo, 'r', encoding='utf-8') as f:
+                    for pedidos_guild in json.load(f).values():
+                        for pedido in pedidos_guild.values():
+                            self._indexar(pedido)
+            print(f"✅ Pedidos de set pendentes carregados: {sum(len(p) for p in self.pedidos.values())}")
+        except Exception as e:
+            print(f"❌ Erro ao carregar pedidos pendentes: {e}")
+
+    def salvar(self):
+        """Agenda a gravação (agrupada e fora do event loop)"""
+        self.gravacao.salvar()
+
+    def descarregar(self):
+        """Grava alterações pendentes na hora (encerramento do bot)"""
+        self.gravacao.descarregar()
+
+    def _indexar(self, pedido):
+        guild_id = str(pedido["guild_id"])
+        message_id = str(pedido["message_id"])
+        self.pedidos.setdefault(guild_id, {})[message_id] = pedido
+        self.por_fivem.setdefault(guild_id, {})[str(pedido["fivem_id"])] = message_id
+        self.por_usuario.setdefault(guild_id, {})[str(pedido["user_id"])] = message_id
+
+    def reservar(self, guild_id, fivem_id, user_id, ttl=TTL_RESERVA):
+        """Reserva o ID do FiveM para um envio; False se já há pedido pendente ou reserva válida
+
+        Não há await entre a checagem e a reserva, então no event loop ela é
+        atômica: de dois envios simultâneos com o mesmo ID, só um consegue
+        (mesmo que sejam do mesmo usuário, ex: dois formulários abertos).
+        """
+        guild_id = str(guild_id)
+        fivem_id = str(fivem_id)
+        if fivem_id in self.por_fivem.get(guild_id, {}):
+            return False
+
+        agora = time.monotonic()
+        reservas = self.reservas.setdefault(guild_id, {})
+        reserva = reservas.get(fivem_id)
+        if reserva and reserva[1] > agora:
+            return False
+
+        reservas[fivem_id] = (user_id, agora + ttl)
+        return True
+
+    def liberar_reserva(self, guild_id, fivem_id):
+        """Desfaz a reserva de um envio que não chegou ao canal de aprovação"""
+        self.reservas.get(str(guild_id), {}).pop(str(fivem_id), None)
+
+    def adicionar(self, pedido):
+        """Registra um pedido recém-enviado ao canal de aprovação (o pedido passa a segurar o ID)"""
+        pedido.setdefault("criado_em", datetime.now().timestamp())
+        self._indexar(pedido)
+        self.liberar_reserva(pedido["guild_id"], pedido["fivem_id"])
+        self.salvar()
+
+    def remover(self, guild_id, message_id):
+        """Tira o pedido do registro (aprovado, recusado ou mensagem apagada); retorna o pedido"""
+        guild_id = str(guild_id)
+        pedido = self.pedidos.get(guild_id, {}).pop(str(message_id), None)
+        if not pedido:
+            return None
+
+        # Só limpa os índices se ainda apontam para este pedido
+        fivem_id = str(pedido["fivem_id"])
+        if self.por_fivem[guild_id].get(fivem_id) == str(message_id):
+            del self.por_fivem[guild_id][fivem_id]
+        user_id = str(pedido["user_id"])
+        if self.por_usuario[guild_id].get(user_id) == str(message_id):
+            del self.por_usuario[guild_id][user_id]
+
+        self.salvar()
+        return pedido
+
+    def reivindicar(self, guild_id, message_id, pedido=None):
+        """Tira o pedido da fila para aprovar/recusar; None se outro (botão ou lote) já pegou
+
+        Deve ser chamado antes do primeiro await de quem vai processar o
+        pedido. `pedido` é usado para pedidos antigos que não estão no
+        registro (montados a partir da view).
+        """
+        chave = (str(guild_id), str(message_id))
+        if chave in self.reivindicados:
+            return None
+
+        registrado = self.remover(guild_id, message_id)
+        if registrado is None and pedido is None:
+            return None
+
+        pedido = registrado or pedido
+        self.reivindicados.add(chave)
+        # Enquanto é processado, o ID continua ocupado para novos envios
+        self.reservar(guild_id, pedido["fivem_id"], None)
+        return pedido
+
+    def devolver(self, pedido):
+        """Devolve à fila um pedido cuja aprovação/recusa não aconteceu"""
+        self.reivindicados.discard((str(pedido["guild_id"]), str(pedido["message_id"])))
+        pedido.setdefault("criado_em", datetime.now().timestamp())
+        self._indexar(pedido)
+        self.liberar_reserva(pedido["guild_id"], pedido["fivem_id"])
+        self.salvar()
+
+    def concluir(self, pedido):
+        """Encerra um pedido recusado: a mensagem já foi apagada, então o ID volta a ficar livre"""
+        self.reivindicados.discard((str(pedido["guild_id"]), str(pedido["message_id"])))
+        self.liberar_reserva(pedido["guild_id"], pedido["fivem_id"])
+
+    def buscar_mensagem(self, guild_id, message_id):
+        return self.pedidos.get(str(guild_id), {}).get(str(message_id))
+
+    def buscar_fivem(self, guild_id, fivem_id):
+        """Pedido pendente com o ID do FiveM (ou None)"""
+        message_id = self.por_fivem.get(str(guild_id), {}).get(str(fivem_id))
+        return self.buscar_mensagem(guild_id, message_id) if message_id else None
+
+    def buscar_usuario(self, guild_id, user_id):
+        """Pedido pendente do usuário (ou None)"""
+        message_id = self.por_usuario.get(str(guild_id), {}).get(str(user_id))
+        return self.buscar_mensagem(guild_id, message_id) if message_id else None
+
+    def listar(self, guild_id, recrutador_id=None, mais_recentes=False):
+        """Pedidos pendentes da guild ordenados pela idade (mais antigos primeiro por padrão)
+
+        Com `recrutador_id`, só os pedidos indicados por esse recrutador.
+        """
+        pedidos = self.pedidos.get(str(guild_id), {}).values()
+        if recrutador_id is not None:
+            pedidos = [p for p in pedidos if str(p.get("recrutador_id")) == str(recrutador_id)]
+        return sorted(pedidos, key=lambda p: p["criado_em"], reverse=mais_recentes)
+
+    def total(self, guild_id):
+        return len(self.pedidos.get(str(guild_id), {}))
+
+    def todos(self):
+        """Todos os pedidos de todas as guilds (para registrar as views ao iniciar)"""
+        for pedidos_guild in self.pedidos.values():
+            yield from pedidos_guild.values()
+
+def link_pedido(pedido):
+    """Link para a mensagem do pedido no canal de aprovação"""
+    return f"https://discord.com/channels/{pedido['guild_id']}/{pedido['canal_id']}/{pedido['message_id']}"
+
+def pedido_da_mensagem(message):
+    """Reconstrói um pedido a partir do embed "Aguardando aprovação" (importação do histórico)"""
+    if not message.embeds or "Aguardando aprovação" not in (message.embeds[0].description or ""):
+        return None
+
+    desc = message.embeds[0].description
+    user_match = re.search(r'\*\*🆔 Discord ID:\*\* `(\d+)`', desc)
+    id_match = re.search(r'\*\*🎮 ID Fivem:\*\* `([^`]+)`', desc)
+    nick_match = re.search(r'\*\*👤 Nick do Jogo:\*\* `([^`]+)`', desc)
+    recrutador_match = re.search(r'\*\*🤝 Recrutado por:\*\* ([^\n(]+?)(?: \(<@!?(\d+)>\))?\n', desc)
+    if not user_match or not id_match:
+        return None
+
+    return {
+        "guild_id": message.guild.id,
+        "canal_id": message.channel.id,
+        "message_id": message.id,
+        "user_id": int(user_match.group(1)),
+        "fivem_id": id_match.group(1),
+        "nick": nick_match.group(1) if nick_match else "?",
+        "recrutador_fivem_id": None,
+        "recrutador_id": int(recrutador_match.group(2)) if recrutador_match and recrutador_match.group(2) else None,
+        "recrutador_nome": recrutador_match.group(1).strip() if recrutador_match else None,
+        "criado_em": message.created_at.timestamp(),
+    }
@@ -3,6 +3,7 @@ from discord.ext import commands
 from discord import ui, ButtonStyle
 import asyncio
 from datetime import datetime
+from modules.mensagens_diretas import enviar_dm
 
 # ========== CONFIGURAÇÃO ==========
 # Cargos que podem usar o comando (staff)
@@ -114,19 +115,16 @@ class PremioConfirmView(ui.View):
                 embed=embed
             )
             
-            # Tentar enviar DM também
-            try:
-                dm_embed = discord.Embed(
-                    title=self.preset["titulo"],
-                    description=(
-                        f"{self.preset['emoji']} {self.preset['descricao']} {self.preset['emoji']}\n\n"
-                        f"Parabéns! Você ganhou o prêmio de **{self.premio_tipo}** deste mês!"
-                    ),
-                    color=self.preset["cor"]
-                )
-                await self.target_member.send(embed=dm_embed)
-            except:
-                pass
+            # DM também (em segundo plano)
+            dm_embed = discord.Embed(
+                title=self.preset["titulo"],
+                description=(
+                    f"{self.preset['emoji']} {self.preset['descricao']} {self.preset['emoji']}\n\n"
+                    f"Parabéns! Você ganhou o prêmio de **{self.premio_tipo}** deste mês!"
+                ),
+                color=self.preset["cor"]
+            )
+            enviar_dm(self.target_member, embed=dm_embed)
             
             # Apagar mensagem de confirmação
             await self.mensagem_original.delete()
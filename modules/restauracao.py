@@ -0,0 +1,76 @@
+import discord
+import asyncio
+import os
+import time
+
+# ========== CONFIGURAÇÃO ==========
+LIMITE_CONCORRENCIA = int(os.getenv("RESTAURACAO_CONCORRENCIA", "8"))
+TEMPO_LIMITE_BUSCA = float(os.getenv("RESTAURACAO_TEMPO_LIMITE", "10"))
+
+# ========== RESTAURAÇÃO DE PAINÉIS ==========
+async def restaurar_paineis(bot, nome, paineis_ativos, registrar, salvar):
+    """Registra as views dos painéis salvos e confere as mensagens em paralelo
+
+    `paineis_ativos` é a seção da configuração das guilds ({guild_id: dados}).
+    `registrar(guild_id, dados)` é chamado para todo painel salvo antes da
+    busca (add_view só precisa do ID da mensagem), então os botões funcionam
+    mesmo se a busca falhar. A busca só decide se o painel saiu: ele é
+    removido quando a mensagem foi apagada (NotFound). Timeouts e outros erros
+    HTTP são tratados como passageiros e o painel continua salvo.
+    """
+    if not paineis_ativos:
+        return
+
+    inicio = time.perf_counter()
+    print(f"📋 {nome}: verificando {len(paineis_ativos)} painéis salvos...")
+
+    # Fase 1: views registradas para todos os painéis (sem chamar a API)
+    for guild_id, dados in list(paineis_ativos.items()):
+        try:
+            registrar(guild_id, dados)
+        except Exception as e:
+            print(f"  ❌ Erro ao registrar painel da guild {guild_id}: {e}")
+    fim_registro = time.perf_counter()
+
+    # Fase 2: busca das mensagens (no máximo LIMITE_CONCORRENCIA ao mesmo tempo)
+    semaforo = asyncio.Semaphore(LIMITE_CONCORRENCIA)
+    resultado = {"recuperados": 0, "apagados": 0, "falhas": 0, "ignorados": 0}
+
+    async def restaurar(guild_id, dados):
+        guild = bot.get_guild(int(guild_id))
+        canal = guild.get_channel(dados["canal_id"]) if guild else None
+        if not canal or not dados.get("mensagem_id"):
+            # Guild indisponível ou canal fora do cache: mantém para a próxima vez
+            resultado["ignorados"] += 1
+            return
+
+        async with semaforo:
+            try:
+                await asyncio.wait_for(canal.fetch_message(dados["mensagem_id"]), TEMPO_LIMITE_BUSCA)
+            except discord.NotFound:
+                paineis_ativos.pop(guild_id, None)
+                resultado["apagados"] += 1
+                print(f"  🗑️ Painel apagado em #{canal.name} ({guild.name}), removido")
+                return
+            except (asyncio.TimeoutError, discord.HTTPException) as e:
+                resultado["falhas"] += 1
+                print(f"  ⚠️ Falha passageira ao buscar painel em #{canal.name} ({guild.name}): {e!r}, mantido")
+                return
+
+        resultado["recuperados"] += 1
+        print(f"  ✅ Painel recuperado em #{canal.name} ({guild.name})")
+
+    await asyncio.gather(*(restaurar(guild_id, dados) for guild_id, dados in list(paineis_ativos.items())))
+    fim_busca = time.perf_counter()
+
+    # Fase 3: grava a configuração só se algum painel saiu
+    if resultado["apagados"]:
+        salvar()
+    fim = time.perf_counter()
+
+    print(
+        f"⏱️ {nome}: views {(fim_registro - inicio) * 1000:.0f}ms • "
+        f"mensagens {(fim_busca - fim_registro) * 1000:.0f}ms • gravação {(fim - fim_busca) * 1000:.0f}ms • "
+        f"{resultado['recuperados']} recuperados, {resultado['apagados']} apagados, "
+        f"{resultado['falhas']} falhas, {resultado['ignorados']} ignorados"
+    )
@@ -3,7 +3,14 @@ from discord.ext import commands
 from discord import ui, ButtonStyle
 import asyncio
 from datetime import datetime
+import os
 import re
+import time
+from typing import Optional
+from modules.config_guild import config
+from modules.indice_fivem import buscar_membro_por_fivem, get_indice_fivem
+from modules.mensagens_diretas import enviar_dm
+from modules.pedidos_set import RegistroPendentes, link_pedido, pedido_da_mensagem
 
 # ========== CONFIGURAÇÃO ==========
 STAFF_ROLES = [
@@ -21,8 +28,36 @@ STAFF_ROLES = [
     "🎖️ | Sub Elite",
 ]
 
-# Dicionário compartilhado com main.py
-canais_aprovacao = {}
+PEDIDOS_POR_PAGINA = 10
+LIMITE_IMPORTACAO_HISTORICO = 500  # mensagens lidas ao importar pedidos antigos de um canal
+
+# Aprovação/recusa em lote: pedidos processados ao mesmo tempo (edições de membro
+# dividem o mesmo rate limit da guild) e intervalo entre atualizações do progresso
+LIMITE_LOTE = int(os.getenv("SETS_CONCORRENCIA_LOTE", "3"))
+INTERVALO_PROGRESSO_LOTE = 2.0
+
+# Cargo dado na aprovação (primeiro nome encontrado na guild)
+NOMES_CARGO_MEMBRO = ("🙅‍♂️ | Membro", "Membro")
+
+# Pedidos aguardando aprovação (substitui a leitura do histórico do canal)
+pendentes = RegistroPendentes()
+
+# ID do cargo de membro por guild (evita percorrer guild.roles a cada aprovação)
+cargos_membro = {}  # {guild_id: role_id}
+
+def get_cargo_membro(guild):
+    """Cargo de membro da guild, resolvido pelo ID em cache (procura pelo nome só na primeira vez
+    ou se o cargo foi apagado)"""
+    cargo = guild.get_role(cargos_membro.get(guild.id, 0))
+    if cargo:
+        return cargo
+    
+    for nome in NOMES_CARGO_MEMBRO:
+        cargo = discord.utils.get(guild.roles, name=nome)
+        if cargo:
+            cargos_membro[guild.id] = cargo.id
+            return cargo
+    return None
 
 def usuario_pode_aprovar(member: discord.Member) -> bool:
     """Verifica se o usuário pode aprovar sets baseado nos cargos de staff"""
@@ -42,10 +77,7 @@ def usuario_pode_aprovar(member: discord.Member) -> bool:
 
 def buscar_usuario_por_id_fivem(guild: discord.Guild, fivem_id: str) -> discord.Member:
     """Busca usuário pelo ID do FiveM no nickname"""
-    for member in guild.members:
-        if member.nick and member.nick.endswith(f" | {fivem_id}"):
-            return member
-    return None
+    return buscar_membro_por_fivem(guild, fivem_id)
 
 def verificar_id_disponivel(guild: discord.Guild, fivem_id: str) -> tuple:
     """
@@ -55,13 +87,151 @@ def verificar_id_disponivel(guild: discord.Guild, fivem_id: str) -> tuple:
     fivem_id = str(fivem_id)
     
     # Verificar nos nicknames ATUAIS
-    for member in guild.members:
-        if member.nick and member.nick.endswith(f" | {fivem_id}"):
-            return False, f"❌ ID `{fivem_id}` já está em uso por {member.mention}", member
+    member = buscar_membro_por_fivem(guild, fivem_id)
+    if member:
+        return False, f"❌ ID `{fivem_id}` já está em uso por {member.mention}", member
     
     # Se não encontrou ninguém usando, está disponível
     return True, f"✅ ID `{fivem_id}` está disponível!", None
 
+# ========== APROVAÇÃO / RECUSA ==========
+async def aprovar_pedido(client, guild, pedido, aprovador, mensagem=None, confirmar=None):
+    """Aprova um pedido: nick e cargo, mensagem do staff, contagem do recrutador e DM
+    
+    O pedido já deve ter sido tirado da fila com pendentes.reivindicar; se a
+    aprovação não acontece ele é devolvido. `mensagem` é a mensagem do pedido
+    no canal de aprovação (Message ou PartialMessage) e `confirmar(member)`,
+    se passado, devolve uma corrotina que roda junto com a edição da
+    mensagem. Retorna (True, member) ou (False, motivo).
+    """
+    member = guild.get_member(int(pedido["user_id"]))
+    if not member:
+        pendentes.devolver(pedido)
+        return False, "❌ Usuário não encontrado!"
+    
+    fivem_id = pedido["fivem_id"]
+    game_nick = pedido["nick"]
+    
+    # ANTES de aprovar, verificar se o ID ainda está disponível
+    disponivel, motivo, usuario_existente = verificar_id_disponivel(guild, fivem_id)
+    
+    if not disponivel and usuario_existente and usuario_existente.id != member.id:
+        pendentes.devolver(pedido)
+        return False, f"❌ Não é possível aprovar! {motivo}\nEste ID já está sendo usado por outro membro."
+    
+    novo_nick = f"M | {game_nick} | {fivem_id}"
+    if len(novo_nick) > 32:
+        novo_nick = f"M | {game_nick[:15]} | {fivem_id}"
+    
+    # Nick e cargo numa única chamada (roles= substitui a lista inteira)
+    inicio = time.perf_counter()
+    cargo_membro = get_cargo_membro(guild)
+    cargos = [cargo for cargo in member.roles if not cargo.is_default()]
+    if cargo_membro and cargo_membro not in cargos:
+        cargos.append(cargo_membro)
+    
+    try:
+        atualizado = await member.edit(nick=novo_nick, roles=cargos)
+    except Exception:
+        pendentes.devolver(pedido)
+        raise
+    fim_membro = time.perf_counter()
+    
+    # O ID passa a constar no índice já agora (antes do evento do gateway), sem janela
+    # entre sair dos pendentes e aparecer no nickname
+    if atualizado:
+        get_indice_fivem(guild).atualizar(atualizado)
+    
+    embed = discord.Embed(
+        title="✅ SET APROVADO!",
+        description=(
+            f"**👤 Discord:** {member.mention}\n"
+            f"**🎮 ID Fivem:** `{fivem_id}`\n"
+            f"**👤 Nick do Jogo:** `{game_nick}`\n"
+            f"**👑 Aprovado por:** {aprovador.mention}\n"
+            f"**📅 Data:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n"
+            f"✅ **Novo nickname:** `{novo_nick}`\n"
+            f"✅ **Cargo:** 🙅‍♂️ | Membro"
+        ),
+        color=discord.Color.green()
+    )
+    
+    recrutador_fivem_id = pedido.get("recrutador_fivem_id")
+    recrutador_nome = pedido.get("recrutador_nome")
+    if recrutador_nome:
+        embed.description += f"\n✅ **Recrutado por:** {recrutador_nome}"
+    
+    # Disparar evento para o painel de recrutadores
+    if recrutador_fivem_id and recrutador_nome:
+        client.dispatch('recrutamento_contabilizar', {
+            'recrutador_id': recrutador_fivem_id,
+            'recrutador_nome': recrutador_nome,
+            'recrutado_id': member.id,
+            'recrutado_nome': member.name,
+            'data': datetime.now().isoformat()
+        })
+    
+    # Mensagem do staff e confirmação não dependem uma da outra
+    etapas = []
+    if mensagem:
+        etapas.append(mensagem.edit(embed=embed, view=None))
+    if confirmar:
+        etapas.append(confirmar(member))
+    await asyncio.gather(*etapas)
+    fim = time.perf_counter()
+    print(
+        f"⏱️ Set aprovado ({member.name}): {(fim - inicio) * 1000:.0f}ms "
+        f"(membro {(fim_membro - inicio) * 1000:.0f}ms • mensagens {(fim - fim_membro) * 1000:.0f}ms)"
+    )
+    
+    # DM fora do caminho da interação
+    dm_embed = discord.Embed(
+        title="✅ SEU SET FOI APROVADO!",
+        description=(
+            f"Parabéns! Seu pedido de set foi aprovado!\n\n"
+            f"**📋 Detalhes:**\n"
+            f"• **Nickname:** `{novo_nick}`\n"
+            f"• **ID Fivem:** `{fivem_id}`\n"
+            f"• **Cargo:** 🙅‍♂️ | Membro"
+        ),
+        color=discord.Color.green()
+    )
+    enviar_dm(member, embed=dm_embed)
+    return True, member
+
+async def recusar_pedido(guild, pedido, recusador, canal, mensagem):
+    """Recusa um pedido (já tirado da fila com pendentes.reivindicar): registro no canal,
+    apaga o pedido e avisa o usuário por DM"""
+    embed = discord.Embed(
+        title="❌ SET RECUSADO",
+        description=(
+            f"**👤 Discord:** <@{pedido['user_id']}>\n"
+            f"**🎮 ID Fivem:** `{pedido['fivem_id']}`\n"
+            f"**👤 Nick do Jogo:** `{pedido['nick']}`\n"
+            f"**👑 Recusado por:** {recusador.mention}\n"
+            f"**📅 Data:** {datetime.now().strftime('%d/%m/%Y %H:%M')}"
+        ),
+        color=discord.Color.red()
+    )
+    
+    if pedido.get("recrutador_nome"):
+        embed.description += f"\n**🤝 Recrutado por:** {pedido['recrutador_nome']}"
+    
+    try:
+        await canal.send(embed=embed)
+        await mensagem.delete()
+    except Exception:
+        pendentes.devolver(pedido)
+        raise
+    pendentes.concluir(pedido)
+    
+    member = guild.get_member(int(pedido["user_id"]))
+    if member:
+        enviar_dm(
+            member, content=f"❌ Seu pedido de set (ID: `{pedido['fivem_id']}`) foi recusado por {recusador.name}."
+        )
+    return True, member
+
 # ========== VIEW DO STAFF ==========
 class SetStaffView(ui.View):
     """View com botões para staff aprovar/recusar"""
@@ -74,6 +244,34 @@ class SetStaffView(ui.View):
         self.recrutador_id = recrutador_id
         self.recrutador_nome = recrutador_nome
     
+    @classmethod
+    def de_pedido(cls, pedido):
+        """Recria a view de um pedido salvo (botões voltam a funcionar após reiniciar)"""
+        return cls(
+            pedido["fivem_id"],
+            pedido["nick"],
+            pedido["user_id"],
+            None,
+            pedido.get("recrutador_fivem_id"),
+            pedido.get("recrutador_nome")
+        )
+    
+    def reivindicar_pedido(self, interaction):
+        """Tira da fila o pedido desta mensagem (None se já está sendo processado)
+        
+        Pedidos antigos que não estão no registro são montados a partir da view.
+        """
+        return pendentes.reivindicar(interaction.guild.id, interaction.message.id, {
+            "guild_id": interaction.guild.id,
+            "canal_id": interaction.channel.id,
+            "message_id": interaction.message.id,
+            "user_id": self.user_id,
+            "fivem_id": self.fivem_id,
+            "nick": self.game_nick,
+            "recrutador_fivem_id": self.recrutador_id,
+            "recrutador_nome": self.recrutador_nome,
+        })
+    
     @ui.button(label="✅ Aprovar Set", style=ButtonStyle.green, custom_id="sets_aprovar_btn", row=0)
     async def aprovar_set(self, interaction: discord.Interaction, button: ui.Button):
         if not usuario_pode_aprovar(interaction.user):
@@ -82,82 +280,19 @@ class SetStaffView(ui.View):
         
         await interaction.response.defer()
         
+        pedido = self.reivindicar_pedido(interaction)
+        if not pedido:
+            await interaction.followup.send("❌ Este pedido já está sendo processado!", ephemeral=True)
+            return
+        
         try:
-            member = interaction.guild.get_member(self.user_id)
-            if not member:
-                await interaction.followup.send("❌ Usuário não encontrado!", ephemeral=True)
-                return
-            
-            # ANTES de aprovar, verificar se o ID ainda está disponível
-            disponivel, motivo, usuario_existente = verificar_id_disponivel(interaction.guild, self.fivem_id)
-            
-            if not disponivel and usuario_existente and usuario_existente.id != member.id:
-                await interaction.followup.send(
-                    f"❌ Não é possível aprovar! {motivo}\n"
-                    f"Este ID já está sendo usado por outro membro.",
-                    ephemeral=True
-                )
-                return
-            
-            novo_nick = f"M | {self.game_nick} | {self.fivem_id}"
-            if len(novo_nick) > 32:
-                novo_nick = f"M | {self.game_nick[:15]} | {self.fivem_id}"
-            
-            await member.edit(nick=novo_nick)
-            
-            cargo_membro = discord.utils.get(interaction.guild.roles, name="🙅‍♂️ | Membro")
-            if not cargo_membro:
-                cargo_membro = discord.utils.get(interaction.guild.roles, name="Membro")
-            
-            if cargo_membro:
-                await member.add_roles(cargo_membro)
-            
-            embed = discord.Embed(
-                title="✅ SET APROVADO!",
-                description=(
-                    f"**👤 Discord:** {member.mention}\n"
-                    f"**🎮 ID Fivem:** `{self.fivem_id}`\n"
-                    f"**👤 Nick do Jogo:** `{self.game_nick}`\n"
-                    f"**👑 Aprovado por:** {interaction.user.mention}\n"
-                    f"**📅 Data:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n"
-                    f"✅ **Novo nickname:** `{novo_nick}`\n"
-                    f"✅ **Cargo:** 🙅‍♂️ | Membro"
-                ),
-                color=discord.Color.green()
+            aprovado, resultado = await aprovar_pedido(
+                interaction.client, interaction.guild, pedido, interaction.user,
+                interaction.message,
+                confirmar=lambda member: interaction.followup.send(f"✅ Set de {member.mention} aprovado!", ephemeral=True)
             )
-            
-            if self.recrutador_nome:
-                embed.description += f"\n✅ **Recrutado por:** {self.recrutador_nome}"
-            
-            # Disparar evento para o painel de recrutadores
-            if self.recrutador_id and self.recrutador_nome:
-                interaction.client.dispatch('recrutamento_contabilizar', {
-                    'recrutador_id': self.recrutador_id,
-                    'recrutador_nome': self.recrutador_nome,
-                    'recrutado_id': self.user_id,
-                    'recrutado_nome': member.name,
-                    'data': datetime.now().isoformat()
-                })
-            
-            self.clear_items()
-            await interaction.message.edit(embed=embed, view=self)
-            await interaction.followup.send(f"✅ Set de {member.mention} aprovado!", ephemeral=True)
-            
-            try:
-                dm_embed = discord.Embed(
-                    title="✅ SEU SET FOI APROVADO!",
-                    description=(
-                        f"Parabéns! Seu pedido de set foi aprovado!\n\n"
-                        f"**📋 Detalhes:**\n"
-                        f"• **Nickname:** `{novo_nick}`\n"
-                        f"• **ID Fivem:** `{self.fivem_id}`\n"
-                        f"• **Cargo:** 🙅‍♂️ | Membro"
-                    ),
-                    color=discord.Color.green()
-                )
-                await member.send(embed=dm_embed)
-            except:
-                pass
+            if not aprovado:
+                await interaction.followup.send(resultado, ephemeral=True)
                 
         except Exception as e:
             await interaction.followup.send(f"❌ Erro: {e}", ephemeral=True)
@@ -170,31 +305,18 @@ class SetStaffView(ui.View):
         
         await interaction.response.defer()
         
+        pedido = self.reivindicar_pedido(interaction)
+        if not pedido:
+            await interaction.followup.send("❌ Este pedido já está sendo processado!", ephemeral=True)
+            return
+        
         try:
-            embed = discord.Embed(
-                title="❌ SET RECUSADO",
-                description=(
-                    f"**👤 Discord:** {self.discord_user.mention}\n"
-                    f"**🎮 ID Fivem:** `{self.fivem_id}`\n"
-                    f"**👤 Nick do Jogo:** `{self.game_nick}`\n"
-                    f"**👑 Recusado por:** {interaction.user.mention}\n"
-                    f"**📅 Data:** {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-                ),
-                color=discord.Color.red()
+            await recusar_pedido(
+                interaction.guild, pedido, interaction.user,
+                interaction.channel, interaction.message
             )
-            
-            if self.recrutador_nome:
-                embed.description += f"\n**🤝 Recrutado por:** {self.recrutador_nome}"
-            
-            await interaction.channel.send(embed=embed)
-            await interaction.message.delete()
             await interaction.followup.send("✅ Set recusado!", ephemeral=True)
             
-            try:
-                await self.discord_user.send(f"❌ Seu pedido de set (ID: `{self.fivem_id}`) foi recusado por {interaction.user.name}.")
-            except:
-                pass
-            
         except Exception as e:
             await interaction.followup.send(f"❌ Erro: {e}", ephemeral=True)
 
@@ -252,7 +374,7 @@ class SetForm(ui.Modal, title="📝 Pedido de Set"):
                 return
             
             # Verificar se canal de aprovação está configurado
-            canal_id = canais_aprovacao.get(interaction.guild.id)
+            canal_id = config.get(interaction.guild.id, "canal_aprovacao")
             if not canal_id:
                 await interaction.followup.send(
                     "❌ Canal de aprovação não configurado!\n"
@@ -266,14 +388,6 @@ class SetForm(ui.Modal, title="📝 Pedido de Set"):
                 await interaction.followup.send("❌ Canal de aprovação não encontrado!", ephemeral=True)
                 return
             
-            # Verificar se ID já existe em pedidos PENDENTES (não aprovados)
-            async for message in canal.history(limit=200):
-                if message.embeds and "Aguardando aprovação" in (message.embeds[0].description or ""):
-                    for embed in message.embeds:
-                        if embed.description and f"**🎮 ID Fivem:** `{self.id_fivem.value}`" in embed.description:
-                            await interaction.followup.send(f"❌ Já existe um pedido PENDENTE com o ID `{self.id_fivem.value}`!", ephemeral=True)
-                            return
-            
             # Processar recrutador
             recrutador_member = buscar_usuario_por_id_fivem(interaction.guild, self.recrutador.value)
             
@@ -290,46 +404,16 @@ class SetForm(ui.Modal, title="📝 Pedido de Set"):
             else:
                 recrutador_nome = recrutador_member.name
 
-            # Adicionar ao painel de recrutadores (com ID do recruta)
-            painel_cog = interaction.client.get_cog("PainelRec")
-            if painel_cog:
-                painel_cog.adicionar_recrutamento(
-                    recrutador_member.id,
-                    recrutador_nome,
-                    interaction.user.id,
-                    interaction.user.name
-                )
-            
-            descricao = (
-                f"**👤 Discord:** {interaction.user.mention}\n"
-                f"**🆔 Discord ID:** `{interaction.user.id}`\n"
-                f"**🎮 ID Fivem:** `{self.id_fivem.value}`\n"
-                f"**👤 Nick do Jogo:** `{self.nick.value}`\n"
-                f"**📅 Data:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-            )
-            
-            descricao += f"\n**🤝 Recrutado por:** {recrutador_nome}"
-            if recrutador_member:
-                descricao += f" ({recrutador_member.mention})"
-            
-            descricao += "\n\n**⏳ Status:** Aguardando aprovação"
-            
-            embed = discord.Embed(
-                title="🎮 NOVO PEDIDO DE SET",
-                description=descricao,
-                color=discord.Color.purple()
-            )
-            
-            view = SetStaffView(
-                self.id_fivem.value,
-                self.nick.value,
-                interaction.user.id,
-                interaction.user,
-                self.recrutador.value,
-                recrutador_nome
-            )
+            # Reserva o ID antes do primeiro await: outro envio com o mesmo ID é recusado aqui
+            if not pendentes.reservar(interaction.guild.id, self.id_fivem.value, interaction.user.id):
+                await interaction.followup.send(f"❌ Já existe um pedido PENDENTE com o ID `{self.id_fivem.value}`!", ephemeral=True)
+                return
             
-            await canal.send(embed=embed, view=view)
+            try:
+                await self.enviar_pedido(interaction, canal, recrutador_member, recrutador_nome)
+            except Exception:
+                pendentes.liberar_reserva(interaction.guild.id, self.id_fivem.value)
+                raise
             
             await interaction.followup.send(
                 f"✅ **Pedido enviado!**\n"
@@ -341,6 +425,62 @@ class SetForm(ui.Modal, title="📝 Pedido de Set"):
             
         except Exception as e:
             await interaction.followup.send(f"❌ Erro: {e}", ephemeral=True)
+    
+    async def enviar_pedido(self, interaction, canal, recrutador_member, recrutador_nome):
+        """Envia o pedido ao canal de aprovação e registra como pendente"""
+        # Adicionar ao painel de recrutadores (com ID do recruta)
+        painel_cog = interaction.client.get_cog("PainelRec")
+        if painel_cog:
+            painel_cog.adicionar_recrutamento(
+                interaction.guild.id,
+                recrutador_member.id,
+                recrutador_nome,
+                interaction.user.id,
+                interaction.user.name
+            )
+        
+        descricao = (
+            f"**👤 Discord:** {interaction.user.mention}\n"
+            f"**🆔 Discord ID:** `{interaction.user.id}`\n"
+            f"**🎮 ID Fivem:** `{self.id_fivem.value}`\n"
+            f"**👤 Nick do Jogo:** `{self.nick.value}`\n"
+            f"**📅 Data:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
+        )
+        
+        descricao += f"\n**🤝 Recrutado por:** {recrutador_nome}"
+        if recrutador_member:
+            descricao += f" ({recrutador_member.mention})"
+        
+        descricao += "\n\n**⏳ Status:** Aguardando aprovação"
+        
+        embed = discord.Embed(
+            title="🎮 NOVO PEDIDO DE SET",
+            description=descricao,
+            color=discord.Color.purple()
+        )
+        
+        view = SetStaffView(
+            self.id_fivem.value,
+            self.nick.value,
+            interaction.user.id,
+            interaction.user,
+            self.recrutador.value,
+            recrutador_nome
+        )
+        
+        mensagem = await canal.send(embed=embed, view=view)
+        pendentes.adicionar({
+            "guild_id": interaction.guild.id,
+            "canal_id": canal.id,
+            "message_id": mensagem.id,
+            "user_id": interaction.user.id,
+            "fivem_id": self.id_fivem.value,
+            "nick": self.nick.value,
+            "recrutador_fivem_id": self.recrutador.value,
+            "recrutador_id": recrutador_member.id,
+            "recrutador_nome": recrutador_nome,
+        })
+        return mensagem
 
 # ========== VIEW PRINCIPAL ==========
 class SetOpenView(ui.View):
@@ -353,6 +493,130 @@ class SetOpenView(ui.View):
         modal = SetForm()
         await interaction.response.send_modal(modal)
 
+# ========== VIEW DA FILA DE PENDENTES ==========
+class PendentesView(ui.View):
+    """Lista paginada dos pedidos pendentes (lida do registro, sem histórico do canal)"""
+    
+    def __init__(self, guild, recrutador=None, mais_recentes=False):
+        super().__init__(timeout=180)
+        self.guild = guild
+        self.recrutador = recrutador
+        self.mais_recentes = mais_recentes
+        self.pagina = 0
+        self.pedidos_por_pagina = PEDIDOS_POR_PAGINA
+        self.atualizar_botao_ordem()
+    
+    def listar(self):
+        return pendentes.listar(
+            self.guild.id,
+            self.recrutador.id if self.recrutador else None,
+            self.mais_recentes
+        )
+    
+    def atualizar_botao_ordem(self):
+        self.alternar_ordem.label = "🔃 Mais antigos primeiro" if self.mais_recentes else "🔃 Mais recentes primeiro"
+    
+    def criar_embed(self):
+        """Cria o embed da página atual"""
+        pedidos = self.listar()
+        total_paginas = max(1, (len(pedidos) + self.pedidos_por_pagina - 1) // self.pedidos_por_pagina)
+        self.pagina = min(self.pagina, total_paginas - 1)
+        
+        descricao = f"Total: **{len(pedidos)}** pedidos"
+        if self.recrutador:
+            descricao += f"\nRecrutador: {self.recrutador.mention}"
+        canal = self.guild.get_channel(config.get(self.guild.id, "canal_aprovacao") or 0)
+        if canal:
+            descricao += f"\nCanal: {canal.mention}"
+        
+        embed = discord.Embed(
+            title="📋 Pedidos Pendentes",
+            description=descricao,
+            color=discord.Color.blue()
+        )
+        
+        if not pedidos:
+            embed.description += "\n\n✅ Nenhum pedido pendente!"
+        
+        inicio = self.pagina * self.pedidos_por_pagina
+        for i, pedido in enumerate(pedidos[inicio:inicio + self.pedidos_por_pagina], inicio + 1):
+            valor = f"**Nick:** `{pedido['nick']}` • <@{pedido['user_id']}>"
+            if pedido.get("recrutador_nome"):
+                valor += f"\n**Recrutador:** {pedido['recrutador_nome']}"
+                if pedido.get("recrutador_id"):
+                    valor += f" (<@{pedido['recrutador_id']}>)"
+            valor += f"\n⏱️ <t:{int(pedido['criado_em'])}:R> • [Ver pedido]({link_pedido(pedido)})"
+            
+            embed.add_field(name=f"#{i} • ID `{pedido['fivem_id']}`", value=valor, inline=False)
+        
+        ordem = "mais recentes primeiro" if self.mais_recentes else "mais antigos primeiro"
+        embed.set_footer(text=f"Página {self.pagina + 1} de {total_paginas} • {ordem}")
+        return embed
+    
+    @ui.button(label="◀ Anterior", style=ButtonStyle.secondary, row=0)
+    async def anterior(self, interaction: discord.Interaction, button: ui.Button):
+        if self.pagina > 0:
+            self.pagina -= 1
+            await interaction.response.edit_message(embed=self.criar_embed(), view=self)
+        else:
+            await interaction.response.send_message("❌ Você já está na primeira página!", ephemeral=True)
+    
+    @ui.button(label="Próxima ▶", style=ButtonStyle.secondary, row=0)
+    async def proxima(self, interaction: discord.Interaction, button: ui.Button):
+        total_paginas = (len(self.listar()) + self.pedidos_por_pagina - 1) // self.pedidos_por_pagina
+        
+        if self.pagina < total_paginas - 1:
+            self.pagina += 1
+            await interaction.response.edit_message(embed=self.criar_embed(), view=self)
+        else:
+            await interaction.response.send_message("❌ Você já está na última página!", ephemeral=True)
+    
+    @ui.button(label="🔃", style=ButtonStyle.primary, row=0)
+    async def alternar_ordem(self, interaction: discord.Interaction, button: ui.Button):
+        self.mais_recentes = not self.mais_recentes
+        self.pagina = 0
+        self.atualizar_botao_ordem()
+        await interaction.response.edit_message(embed=self.criar_embed(), view=self)
+
+# ========== APROVAÇÃO / RECUSA EM LOTE ==========
+class ConfirmaLoteView(ui.View):
+    """View para confirmar a aprovação/recusa de vários pedidos"""
+    
+    def __init__(self, cog, ctx, pedidos, acao):
+        super().__init__(timeout=60)
+        self.cog = cog
+        self.ctx = ctx
+        self.pedidos = pedidos
+        self.acao = acao
+    
+    @ui.button(label="✅ Confirmar", style=ButtonStyle.danger)
+    async def confirmar(self, interaction: discord.Interaction, button: ui.Button):
+        if interaction.user != self.ctx.author:
+            await interaction.response.send_message("❌ Apenas quem executou o comando pode confirmar!", ephemeral=True)
+            return
+        
+        await interaction.response.defer()
+        self.stop()
+        await self.cog.processar_lote(self.ctx, interaction.message, self.pedidos, self.acao)
+    
+    @ui.button(label="❌ Cancelar", style=ButtonStyle.secondary)
+    async def cancelar(self, interaction: discord.Interaction, button: ui.Button):
+        if interaction.user != self.ctx.author:
+            await interaction.response.send_message("❌ Apenas quem executou o comando pode cancelar!", ephemeral=True)
+            return
+        
+        await interaction.response.defer()
+        self.stop()
+        await interaction.message.delete()
+        await self.ctx.send("❌ Operação cancelada.", delete_after=3)
+
+def converter_idade(texto):
+    """"30m", "2h", "1d" → segundos (None se o formato for inválido)"""
+    match = re.fullmatch(r'(\d+)\s*([mhd])', texto.strip().lower())
+    if not match:
+        return None
+    return int(match.group(1)) * {"m": 60, "h": 3600, "d": 86400}[match.group(2)]
+
 # ========== COG PRINCIPAL ==========
 class SetsCog(commands.Cog, name="Sets"):
     """Sistema de Sets e Recrutamentos"""
@@ -366,6 +630,35 @@ class SetsCog(commands.Cog, name="Sets"):
         """Apenas log quando o bot estiver pronto"""
         print("✅ Sets cog pronto!")
     
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        """Pedido apagado manualmente do canal de aprovação deixa de estar pendente"""
+        if payload.guild_id:
+            pendentes.remover(payload.guild_id, payload.message_id)
+    
+    async def importar_pendentes(self, canal):
+        """Registra pedidos pendentes antigos que só existem no histórico do canal
+        
+        Feito uma única vez por canal (marcado na configuração da guild) e só
+        nas últimas LIMITE_IMPORTACAO_HISTORICO mensagens.
+        """
+        importados_antes = config.get(canal.guild.id, "historico_importado", [])
+        if canal.id in importados_antes:
+            return 0
+        
+        importados = 0
+        async for message in canal.history(limit=LIMITE_IMPORTACAO_HISTORICO):
+            if message.author != self.bot.user or pendentes.buscar_mensagem(canal.guild.id, message.id):
+                continue
+            pedido = pedido_da_mensagem(message)
+            if pedido:
+                pendentes.adicionar(pedido)
+                self.bot.add_view(SetStaffView.de_pedido(pedido), message_id=message.id)
+                importados += 1
+        
+        config.definir(canal.guild.id, "historico_importado", importados_antes + [canal.id])
+        return importados
+    
     @commands.command(name="aprovamento", aliases=["aprov"])
     @commands.has_permissions(administrator=True)
     async def set_aprovamento(self, ctx, canal: discord.TextChannel = None):
@@ -373,13 +666,21 @@ class SetsCog(commands.Cog, name="Sets"):
         if not canal:
             canal = ctx.channel
         
-        canais_aprovacao[ctx.guild.id] = canal.id
+        config.definir(ctx.guild.id, "canal_aprovacao", canal.id)
+        
+        importados = 0
+        try:
+            importados = await self.importar_pendentes(canal)
+        except Exception as e:
+            print(f"⚠️ Erro ao importar pedidos pendentes de #{canal.name}: {e}")
         
         embed = discord.Embed(
             title="✅ Canal de Aprovação Definido",
             description=f"Os pedidos de set agora serão enviados para: {canal.mention}",
             color=discord.Color.green()
         )
+        if importados:
+            embed.description += f"\n📥 {importados} pedidos pendentes antigos registrados"
         
         msg_confirmacao = await ctx.send(embed=embed)
         
@@ -398,7 +699,8 @@ class SetsCog(commands.Cog, name="Sets"):
     async def setup_set(self, ctx):
         """🎮 Configura o painel de pedido de set"""
         
-        if ctx.guild.id not in canais_aprovacao:
+        canal_id = config.get(ctx.guild.id, "canal_aprovacao")
+        if not canal_id:
             embed_aviso = discord.Embed(
                 title="⚠️ Configure o Canal de Aprovação Primeiro!",
                 description=(
@@ -421,7 +723,7 @@ class SetsCog(commands.Cog, name="Sets"):
             
             return
         
-        canal = ctx.guild.get_channel(canais_aprovacao[ctx.guild.id])
+        canal = ctx.guild.get_channel(canal_id)
         
         embed = discord.Embed(
             title="🎮 **PEÇA SEU SET AQUI!**",
@@ -468,77 +770,162 @@ class SetsCog(commands.Cog, name="Sets"):
             return
         
         # Se não achou nos nicknames, verificar nos pedidos pendentes
-        canal_id = canais_aprovacao.get(ctx.guild.id)
-        if canal_id:
-            canal = ctx.guild.get_channel(canal_id)
-            if canal:
-                async for message in canal.history(limit=200):
-                    if message.embeds and "Aguardando aprovação" in (message.embeds[0].description or ""):
-                        for embed in message.embeds:
-                            if embed.description and f"**🎮 ID Fivem:** `{id_fivem}`" in embed.description:
-                                await ctx.send(f"❌ ID `{id_fivem}` tem um pedido pendente! [Ver]({message.jump_url})")
-                                return
+        pedido = pendentes.buscar_fivem(ctx.guild.id, id_fivem)
+        if pedido:
+            await ctx.send(f"❌ ID `{id_fivem}` tem um pedido pendente! [Ver]({link_pedido(pedido)})")
+            return
         
         await ctx.send(f"✅ ID `{id_fivem}` está disponível!")
     
     @commands.command(name="sets_pendentes", aliases=["pendentes"])
     @commands.has_permissions(administrator=True)
-    async def sets_pendentes(self, ctx):
-        """📋 Mostra todos os pedidos pendentes"""
+    async def sets_pendentes(self, ctx, recrutador: Optional[discord.Member] = None, ordem: str = "antigos"):
+        """📋 Lista os pedidos pendentes (filtro por recrutador, ordem: antigos/recentes)"""
+        view = PendentesView(ctx.guild, recrutador, mais_recentes=ordem.lower() in ("recentes", "novos"))
+        await ctx.send(embed=view.criar_embed(), view=view)
+    
+    async def comando_lote(self, ctx, acao, recrutador, idade):
+        """Seleciona os pedidos pelos filtros e pede confirmação"""
+        segundos = None
+        if idade:
+            segundos = converter_idade(idade)
+            if segundos is None:
+                await ctx.send("❌ Idade inválida! Use por exemplo `30m`, `2h` ou `1d`.")
+                return
         
-        canal_id = canais_aprovacao.get(ctx.guild.id)
-        if not canal_id:
-            await ctx.send("❌ Canal de aprovação não configurado! Use `!aprovamento #canal` primeiro.")
-            return
+        pedidos = pendentes.listar(ctx.guild.id, recrutador.id if recrutador else None)
+        if segundos:
+            limite = datetime.now().timestamp() - segundos
+            pedidos = [pedido for pedido in pedidos if pedido["criado_em"] <= limite]
         
-        canal = ctx.guild.get_channel(canal_id)
-        if not canal:
-            await ctx.send("❌ Canal de aprovação não encontrado!")
+        if not pedidos:
+            await ctx.send("✅ Nenhum pedido pendente com esses filtros!")
             return
         
-        pedidos = []
-        async for message in canal.history(limit=100):
-            if message.embeds and "Aguardando aprovação" in (message.embeds[0].description or ""):
-                pedidos.append(message)
+        descricao = f"**{len(pedidos)}** pedidos serão **{'aprovados' if acao == 'aprovar' else 'recusados'}**"
+        if recrutador:
+            descricao += f"\nRecrutador: {recrutador.mention}"
+        if idade:
+            descricao += f"\nPendentes há mais de: `{idade}`"
         
-        if not pedidos:
-            await ctx.send("✅ Nenhum pedido pendente!")
-            return
+        embed = discord.Embed(
+            title="⚠️ Confirmar Operação em Lote",
+            description=descricao,
+            color=discord.Color.orange()
+        )
+        await ctx.send(embed=embed, view=ConfirmaLoteView(self, ctx, pedidos, acao))
+    
+    async def processar_um(self, guild, autor, pedido, acao):
+        """Aprova/recusa um pedido do lote; retorna (sucesso, motivo)"""
+        # Tira da fila antes do primeiro await: um clique no botão do mesmo pedido não o pega mais
+        pedido = pendentes.reivindicar(guild.id, pedido["message_id"])
+        if not pedido:
+            return None, "já resolvido"
+        
+        canal = guild.get_channel(int(pedido["canal_id"]))
+        mensagem = canal.get_partial_message(int(pedido["message_id"])) if canal else None
+        
+        if acao == "aprovar":
+            return await aprovar_pedido(self.bot, guild, pedido, autor, mensagem)
+        
+        if not canal:
+            pendentes.devolver(pedido)
+            return False, "canal de aprovação não encontrado"
+        return await recusar_pedido(guild, pedido, autor, canal, mensagem)
+    
+    def embed_lote(self, acao, resultado, total, concluido=False):
+        feitos = resultado["sucessos"] + resultado["falhas"] + resultado["ignorados"]
+        verbo = "Aprovando" if acao == "aprovar" else "Recusando"
         
         embed = discord.Embed(
-            title="📋 Pedidos Pendentes",
-            description=f"Total: **{len(pedidos)}** pedidos\nCanal: {canal.mention}",
-            color=discord.Color.blue()
+            title="✅ Lote Concluído" if concluido else f"⏳ {verbo} Pedidos...",
+            description=(
+                f"Progresso: **{feitos}/{total}**\n"
+                f"✅ {resultado['sucessos']} • ❌ {resultado['falhas']} falhas • ⏭️ {resultado['ignorados']} já resolvidos"
+            ),
+            color=discord.Color.green() if concluido else discord.Color.blue()
         )
         
-        for i, msg in enumerate(pedidos[:5], 1):
-            desc = msg.embeds[0].description or ""
-            
-            id_match = re.search(r'\*\*🎮 ID Fivem:\*\* `([^`]+)`', desc)
-            nick_match = re.search(r'\*\*👤 Nick do Jogo:\*\* `([^`]+)`', desc)
-            recrutador_match = re.search(r'\*\*🤝 Recrutado por:\*\* ([^\n]+)', desc)
-            
-            valor = f"**ID:** `{id_match.group(1) if id_match else '?'}`\n**Nick:** `{nick_match.group(1) if nick_match else '?'}`"
-            if recrutador_match:
-                valor += f"\n**Recrutador:** {recrutador_match.group(1)}"
-            
+        if resultado["erros"]:
             embed.add_field(
-                name=f"Pedido #{i}",
-                value=valor + f"\n[Ver pedido]({msg.jump_url})",
+                name="❌ Falhas",
+                value="\n".join(resultado["erros"][:10])[:1024],
                 inline=False
             )
+        return embed
+    
+    async def processar_lote(self, ctx, mensagem, pedidos, acao):
+        """Processa os pedidos com no máximo LIMITE_LOTE ao mesmo tempo
         
-        if len(pedidos) > 5:
-            embed.add_field(
-                name="📊 Estatísticas",
-                value=f"Mostrando 5 de {len(pedidos)} pedidos\nUse `!check_id [ID]` para verificar um ID específico",
-                inline=False
-            )
+        Cada trabalhador faz edição do membro e da mensagem do pedido em
+        sequência, então enquanto um espera a mensagem outro já edita o
+        próximo membro. O progresso é mostrado numa única mensagem, editada a
+        cada INTERVALO_PROGRESSO_LOTE segundos.
+        """
+        inicio = time.perf_counter()
+        fila = asyncio.Queue()
+        for pedido in pedidos:
+            fila.put_nowait(pedido)
+        
+        resultado = {"sucessos": 0, "falhas": 0, "ignorados": 0, "erros": []}
         
-        await ctx.send(embed=embed)
+        async def trabalhador():
+            while not fila.empty():
+                pedido = fila.get_nowait()
+                try:
+                    sucesso, motivo = await self.processar_um(ctx.guild, ctx.author, pedido, acao)
+                except Exception as e:
+                    sucesso, motivo = False, str(e)
+                
+                if sucesso is None:
+                    resultado["ignorados"] += 1
+                elif sucesso:
+                    resultado["sucessos"] += 1
+                else:
+                    resultado["falhas"] += 1
+                    resultado["erros"].append(f"`{pedido['fivem_id']}` <@{pedido['user_id']}>: {motivo}")
+        
+        async def relatar():
+            while True:
+                await asyncio.sleep(INTERVALO_PROGRESSO_LOTE)
+                try:
+                    await mensagem.edit(embed=self.embed_lote(acao, resultado, len(pedidos)), view=None)
+                except discord.HTTPException:
+                    pass
+        
+        relator = asyncio.create_task(relatar())
+        try:
+            await mensagem.edit(embed=self.embed_lote(acao, resultado, len(pedidos)), view=None)
+            await asyncio.gather(*(trabalhador() for _ in range(min(LIMITE_LOTE, len(pedidos)))))
+        finally:
+            relator.cancel()
+        
+        embed = self.embed_lote(acao, resultado, len(pedidos), concluido=True)
+        embed.set_footer(text=f"⏱️ {time.perf_counter() - inicio:.1f}s • por {ctx.author.name}")
+        await mensagem.edit(embed=embed, view=None)
+        print(
+            f"📦 Lote ({acao}) em {ctx.guild.name}: {resultado['sucessos']} ok, "
+            f"{resultado['falhas']} falhas, {resultado['ignorados']} ignorados em {time.perf_counter() - inicio:.1f}s"
+        )
+    
+    @commands.command(name="aprovar_todos", aliases=["aprovartodos"])
+    @commands.has_permissions(administrator=True)
+    async def aprovar_todos(self, ctx, recrutador: Optional[discord.Member] = None, idade: str = None):
+        """✅ Aprova os pedidos pendentes (filtros: @recrutador, há mais de 30m/2h/1d)"""
+        await self.comando_lote(ctx, "aprovar", recrutador, idade)
+    
+    @commands.command(name="recusar_todos", aliases=["recusartodos"])
+    @commands.has_permissions(administrator=True)
+    async def recusar_todos(self, ctx, recrutador: Optional[discord.Member] = None, idade: str = None):
+        """❌ Recusa os pedidos pendentes (filtros: @recrutador, há mais de 30m/2h/1d)"""
+        await self.comando_lote(ctx, "recusar", recrutador, idade)
 
 # ========== SETUP ==========
 async def setup(bot):
     await bot.add_cog(SetsCog(bot))
     bot.add_view(SetOpenView())
+    
+    pendentes.carregar()
+    for pedido in pendentes.todos():
+        bot.add_view(SetStaffView.de_pedido(pedido), message_id=int(pedido["message_id"]))
     print("✅ Sistema de Sets configurado com views persistentes!")